@@ -0,0 +1,269 @@
+import multiprocessing as mp
+import queue
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+from motor_controller import DEFAULT_BAUDRATE, MotorController, MotorStatus
+from telemetry_server import COMMANDS
+
+# 링 헤더: 기록된 레코드 수, 워커 하트비트(time.time), 워커 상태, 워커 PID
+_HEADER = struct.Struct("<QdII")
+# 레코드: seq, 시각, ID, 에러, 위치, 속도, 부하, 온도, 이동 중, 전압, 전류 (8바이트 정렬)
+_RECORD = struct.Struct("<QdBBHhhBBff6x")
+_SEQ = struct.Struct("<Q")
+
+STATE_STARTING = 0
+STATE_RUNNING = 1
+
+DEFAULT_SLOTS = 4096
+HEARTBEAT_TIMEOUT = 3.0  # s, 이보다 오래 갱신이 없으면 멈춘 워커로 보고 재시작
+RESTART_DELAY_MIN = 0.5  # s
+RESTART_DELAY_MAX = 8.0
+
+
+@dataclass
+class TelemetryRecord:
+    port: str
+    motor_id: int
+    timestamp: float
+    status: MotorStatus
+
+
+class TelemetryRing:
+    # 워커 프로세스 하나가 쓰고 GUI가 읽는 공유 메모리 링 버퍼.
+    # 슬롯마다 seqlock(seq가 홀수면 쓰는 중)으로, 읽는 쪽은 락 없이 찢어진 레코드만 건너뛴다.
+
+    def __init__(self, shm: SharedMemory, slots: int):
+        self.shm = shm
+        self.slots = slots
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, slots: int = DEFAULT_SLOTS) -> "TelemetryRing":
+        shm = SharedMemory(create=True, size=_HEADER.size + slots * _RECORD.size)
+        shm.buf[:_HEADER.size] = bytes(_HEADER.size)
+        return cls(shm, slots)
+
+    @classmethod
+    def attach(cls, name: str, slots: int) -> "TelemetryRing":
+        # spawn 워커는 부모의 resource_tracker를 공유하므로 여기서 등록을 해제하면 안 된다.
+        # 해제(unlink)는 만든 쪽(부모)만 한다.
+        return cls(SharedMemory(name), slots)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def header(self) -> tuple[int, float, int, int]:
+        return _HEADER.unpack_from(self._buf, 0)
+
+    # ── Writer (worker) ──
+
+    def set_state(self, state: int, pid: int) -> None:
+        count, _, _, _ = _HEADER.unpack_from(self._buf, 0)
+        _HEADER.pack_into(self._buf, 0, count, time.time(), state, pid)
+
+    def publish(self, timestamp: float, statuses: dict[int, MotorStatus]) -> None:
+        buf = self._buf
+        count, _, state, pid = _HEADER.unpack_from(buf, 0)
+        for motor_id, s in statuses.items():
+            offset = _HEADER.size + (count % self.slots) * _RECORD.size
+            seq = _SEQ.unpack_from(buf, offset)[0] | 1
+            _SEQ.pack_into(buf, offset, seq)
+            _RECORD.pack_into(
+                buf, offset, seq, timestamp, motor_id, s.error & 0xFF,
+                s.position, s.speed, s.load, s.temperature, s.is_moving,
+                s.voltage, s.current,
+            )
+            _SEQ.pack_into(buf, offset, seq + 1)
+            count += 1
+        # 레코드를 다 쓴 뒤에 개수를 올려야 읽는 쪽이 미완성 슬롯을 보지 않는다
+        _HEADER.pack_into(buf, 0, count, time.time(), state, pid)
+
+    # ── Reader (GUI) ──
+
+    def read_since(self, cursor: int) -> tuple[list[tuple], int]:
+        # cursor 이후의 레코드를 (시각, ID, MotorStatus)로 반환. 뒤처졌으면 남아 있는 가장 오래된 것부터.
+        buf = self._buf
+        count = _HEADER.unpack_from(buf, 0)[0]
+        start = max(cursor, count - self.slots + 1)
+        records = []
+        for i in range(start, count):
+            offset = _HEADER.size + (i % self.slots) * _RECORD.size
+            (seq, t, motor_id, error, position, speed, load,
+             temperature, moving, voltage, current) = _RECORD.unpack_from(buf, offset)
+            if seq & 1 or _SEQ.unpack_from(buf, offset)[0] != seq:
+                continue
+            records.append((t, motor_id, MotorStatus(
+                position=position, speed=speed, temperature=temperature,
+                voltage=round(voltage, 1), current=current, load=load,
+                is_moving=bool(moving), error=error,
+            )))
+        return records, count
+
+    def close(self, unlink: bool = False) -> None:
+        self._buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker_main(port, baudrate, motor_ids, ring_name, slots, commands, interval):
+    # 워커 프로세스: 이 포트의 버스를 단독으로 맡아 폴링하고 명령 큐를 처리한다.
+    # 예외로 끝나면 프로세스가 비정상 종료되고 감독자가 다시 띄운다.
+    ring = TelemetryRing.attach(ring_name, slots)
+    controller = MotorController()
+    try:
+        controller.connect(port, baudrate)
+        if motor_ids:
+            # 스캔을 건너뛰므로 쓰기 응답 설정은 EEPROM에서 직접 읽는다
+            controller.read_identities(motor_ids)
+            ids = motor_ids
+        else:
+            ids = controller.scan_motors()
+        ring.set_state(STATE_RUNNING, mp.current_process().pid)
+        next_tick = time.monotonic()
+        while True:
+            while True:
+                try:
+                    request = commands.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    return
+                cmd, args = request
+                try:
+                    getattr(controller, cmd)(*args)
+                except Exception as e:
+                    print(f"[{port}] {cmd} failed: {e}", file=sys.stderr)
+            ring.publish(time.time(), controller.read_status_many(ids))
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+    finally:
+        controller.disconnect()
+        ring.close()
+
+
+class BusWorker:
+    # 부모 프로세스 쪽 핸들: 링, 명령 큐, 워커 프로세스와 재시작 상태
+
+    def __init__(self, ctx, port: str, baudrate: int, motor_ids: list[int] | None,
+                 interval: float, slots: int):
+        self.port = port
+        self._ctx = ctx
+        self._args = (port, baudrate, motor_ids)
+        self._interval = interval
+        self.ring = TelemetryRing.create(slots)
+        self.commands = ctx.Queue()
+        self.process: mp.Process | None = None
+        self.restarts = 0
+        self._restart_delay = RESTART_DELAY_MIN
+        self._restart_at: float | None = None
+        self._started_at = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def running(self) -> bool:
+        return self.alive and self.ring.header()[2] == STATE_RUNNING
+
+    def start(self) -> None:
+        # 재시작 시 이전 워커가 남긴 상태를 지우되, 레코드 수는 이어 간다
+        self.ring.set_state(STATE_STARTING, 0)
+        self.process = self._ctx.Process(
+            target=_worker_main,
+            args=(*self._args, self.ring.name, self.ring.slots, self.commands, self._interval),
+            name=f"bus-worker {self.port}",
+            daemon=True,
+        )
+        self.process.start()
+        self._started_at = time.monotonic()
+
+    def send(self, cmd: str, *args) -> None:
+        if cmd not in COMMANDS:
+            raise ValueError(f"Unknown command: {cmd}")
+        self.commands.put((cmd, args))
+
+    def check(self, now: float) -> None:
+        # 죽었거나 하트비트가 끊긴 워커를 지수 백오프로 재시작
+        _, heartbeat, state, _ = self.ring.header()
+        hung = state == STATE_RUNNING and time.time() - heartbeat > HEARTBEAT_TIMEOUT
+        if self.alive and not hung:
+            if now - self._started_at > RESTART_DELAY_MAX:
+                self._restart_delay = RESTART_DELAY_MIN
+            return
+        if self._restart_at is None:
+            if self.alive:
+                self.process.kill()
+            self.process.join(1.0)
+            self._restart_at = now + self._restart_delay
+            self._restart_delay = min(self._restart_delay * 2, RESTART_DELAY_MAX)
+        elif now >= self._restart_at:
+            self._restart_at = None
+            self.restarts += 1
+            self.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self.alive:
+            self.commands.put(None)
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(1.0)
+        self.commands.close()
+        self.ring.close(unlink=True)
+
+
+class BusSupervisor:
+    # 시리얼 포트마다 MotorController를 가진 워커 프로세스를 하나씩 띄운다.
+    # 버스끼리 GIL과 Qt 이벤트 루프를 공유하지 않으므로 버스를 늘려도 폴링 지터가 늘지 않는다.
+
+    def __init__(self, ports: list[str], baudrate: int = DEFAULT_BAUDRATE,
+                 motor_ids: list[int] | None = None, interval: float = 0.01,
+                 slots: int = DEFAULT_SLOTS):
+        # Qt 스레드가 도는 프로세스를 fork하지 않도록 spawn 사용
+        ctx = mp.get_context("spawn")
+        self.workers = {port: BusWorker(ctx, port, baudrate, motor_ids, interval, slots) for port in ports}
+        self._cursors = {port: 0 for port in ports}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        for worker in self.workers.values():
+            worker.start()
+        self._thread = threading.Thread(target=self._supervise, name="bus-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        for worker in self.workers.values():
+            worker.stop()
+
+    def send(self, port: str, cmd: str, *args) -> None:
+        self.workers[port].send(cmd, *args)
+
+    def poll(self) -> list[TelemetryRecord]:
+        # 모든 링에서 새 레코드를 모은다 (피클링/파이프 없이 공유 메모리에서 직접 읽음)
+        records = []
+        for port, worker in self.workers.items():
+            rows, self._cursors[port] = worker.ring.read_since(self._cursors[port])
+            records.extend(TelemetryRecord(port, mid, t, status) for t, mid, status in rows)
+        return records
+
+    def _supervise(self) -> None:
+        while not self._stop.wait(0.25):
+            now = time.monotonic()
+            for worker in self.workers.values():
+                worker.check(now)
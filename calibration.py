@@ -0,0 +1,269 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from st3215.values import (
+    STS_GOAL_SPEED_L,
+    STS_LOCK,
+    STS_MIN_ANGLE_LIMIT_L,
+    STS_MODE,
+    STS_OFS_L,
+    STS_PRESENT_POSITION_L,
+    STS_TORQUE_ENABLE,
+)
+
+from motor_controller import EEPROM_WRITE_DELAY, STATUS_BLOCK_LENGTH, MotorController, _decode_status
+from sts_protocol import PacketEngine
+from tracing import traced
+
+# SRAM RW (st3215.values에 없는 레지스터)
+STS_TORQUE_LIMIT = 48
+
+SEEK_MIN = "seek_min"
+SEEK_MAX = "seek_max"
+DONE = "done"
+
+
+@dataclass
+class CalibrationSettings:
+    search_speed: int = 300  # step/s (휠 모드)
+    torque_limit: int = 250  # 0~1000, 하드 스톱에 부딪혀도 안전한 토크
+    load_ratio: float = 0.7  # |부하| > torque_limit × load_ratio 이면 밀고 있는 중
+    current_threshold: float = 400.0  # mA, 부하 대신 전류로도 감지
+    stall_steps: int = 8  # 정지 판정 창에서 허용하는 위치 변화
+    stall_ticks: int = 10  # 정지 판정 창 크기
+    limit_margin: int = 20  # 하드 스톱 안쪽으로 남길 여유
+    tick: float = 0.02  # s
+    timeout: float = 30.0  # s
+
+
+@dataclass
+class CalibrationResult:
+    motor_id: int
+    min_raw: int
+    max_raw: int
+    offset: int
+    min_limit: int
+    max_limit: int
+
+
+@dataclass
+class CalibrationReport:
+    results: dict[int, CalibrationResult] = field(default_factory=dict)
+    failures: dict[int, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class _Axis:
+    __slots__ = ("state", "last_raw", "position", "window", "min_pos", "max_pos")
+
+    def __init__(self, stall_ticks: int):
+        self.state = SEEK_MIN
+        self.last_raw: int | None = None
+        self.position = 0  # 0/4095 경계를 넘어도 이어지는 누적 위치
+        self.window: deque[int] = deque(maxlen=stall_ticks)
+        self.min_pos = 0
+        self.max_pos = 0
+
+    def track(self, raw: int) -> None:
+        if self.last_raw is None:
+            self.position = raw
+        else:
+            self.position += (raw - self.last_raw + 2048) % 4096 - 2048
+        self.last_raw = raw
+        self.window.append(self.position)
+
+
+def _word(value: int) -> list[int]:
+    return [value & 0xFF, value >> 8 & 0xFF]
+
+
+def _signed(value: int, sign_bit: int) -> list[int]:
+    magnitude = abs(value)
+    if value < 0:
+        magnitude |= 1 << sign_bit
+    return _word(magnitude)
+
+
+def _broadcast(engine: PacketEngine, ids: list[int], address: int, data: list[int]) -> None:
+    engine.sync_write(address, len(data), {mid: data for mid in ids})
+
+
+def _eeprom_write(engine: PacketEngine, address: int, length: int, data: dict[int, list[int]]) -> None:
+    # EEPROM 쓰기는 저장에 시간이 걸리므로 다음 명령 전에 기다린다 (remap_ids와 같음)
+    engine.sync_write(address, length, data)
+    time.sleep(EEPROM_WRITE_DELAY)
+
+
+def _is_stalled(axis: _Axis, status, s: CalibrationSettings) -> bool:
+    if len(axis.window) < axis.window.maxlen:
+        return False
+    if max(axis.window) - min(axis.window) > s.stall_steps:
+        return False
+    return abs(status.load) > s.torque_limit * s.load_ratio or status.current > s.current_threshold
+
+
+def _search(engine: PacketEngine, ids: list[int], s: CalibrationSettings, report: CalibrationReport):
+    axes = {mid: _Axis(s.stall_ticks) for mid in ids}
+    engine.sync_write(STS_GOAL_SPEED_L, 2, {mid: _signed(-s.search_speed, 15) for mid in ids})
+    deadline = time.monotonic() + s.timeout
+    active = set(ids)
+    while active:
+        if time.monotonic() > deadline:
+            for mid in active:
+                report.failures[mid] = f"하드 스톱을 찾지 못함 ({axes[mid].state})"
+            break
+        time.sleep(s.tick)
+        replies = engine.sync_read(sorted(active), STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH)
+        speeds: dict[int, list[int]] = {}
+        for mid, (error, data) in replies.items():
+            if len(data) != STATUS_BLOCK_LENGTH:
+                continue
+            status = _decode_status(error, data)
+            axis = axes[mid]
+            axis.track(status.position)
+            if not _is_stalled(axis, status, s):
+                continue
+            axis.window.clear()
+            if axis.state == SEEK_MIN:
+                axis.min_pos = axis.position
+                axis.state = SEEK_MAX
+                speeds[mid] = _signed(s.search_speed, 15)
+            else:
+                axis.max_pos = axis.position
+                axis.state = DONE
+                speeds[mid] = _word(0)
+                active.discard(mid)
+        if speeds:
+            # 방향을 바꾸거나 멈출 모터만 한 패킷으로 묶어 전송
+            engine.sync_write(STS_GOAL_SPEED_L, 2, speeds)
+    _broadcast(engine, ids, STS_GOAL_SPEED_L, _word(0))
+    return axes
+
+
+def _solve(mid: int, axis: _Axis, s: CalibrationSettings) -> CalibrationResult:
+    span = axis.max_pos - axis.min_pos
+    if span <= 2 * s.limit_margin:
+        raise ValueError(f"가동 범위가 너무 좁음 ({span})")
+    if span >= 4096:
+        raise ValueError("하드 스톱 없이 한 바퀴 이상 회전")
+    min_raw = axis.min_pos % 4096
+    center_raw = (axis.min_pos + span // 2) % 4096
+    # 보정값을 빼면 가동 범위 중앙이 2048이 된다 (±2047, 11번 비트가 부호)
+    offset = max(center_raw - 2048, -2047)
+    half = span // 2
+    return CalibrationResult(
+        motor_id=mid,
+        min_raw=min_raw,
+        max_raw=(min_raw + span) % 4096,
+        offset=offset,
+        min_limit=2048 - half + s.limit_margin,
+        max_limit=2048 + half - s.limit_margin,
+    )
+
+
+def _snapshot(engine: PacketEngine, ids: list[int]) -> dict[int, tuple[list[int], list[int], list[int], list[int]]]:
+    # 시작 전 설정을 동기 읽기로 보관: 9~33 (각도 제한, 보정값, 모드)와 48~49 (토크 제한)
+    # 응답은 엔진의 수신 버퍼를 가리키므로 다음 읽기 전에 복사해 둔다
+    replies = engine.sync_read(ids, STS_MIN_ANGLE_LIMIT_L, STS_MODE - STS_MIN_ANGLE_LIMIT_L + 1)
+    eeprom = {mid: list(data) for mid, (_, data) in replies.items()}
+    torque = engine.sync_read(ids, STS_TORQUE_LIMIT, 2)
+    snapshot = {}
+    for mid in ids:
+        if mid not in eeprom or mid not in torque:
+            continue
+        data = eeprom[mid]
+        snapshot[mid] = (data[0:4], data[22:24], [data[24]], list(torque[mid][1]))
+    return snapshot
+
+
+def _restore(engine: PacketEngine, snapshot: dict, calibrated: set[int]) -> None:
+    # 확인된 결과가 없는 모터는 보정값과 각도 제한까지 원래대로, 모든 모터의 모드/토크 제한/잠금은 항상 복원
+    ids = sorted(snapshot)
+    _broadcast(engine, ids, STS_TORQUE_ENABLE, [0])
+    _broadcast(engine, ids, STS_GOAL_SPEED_L, _word(0))
+    failed = [mid for mid in ids if mid not in calibrated]
+    if failed:
+        _eeprom_write(engine, STS_MIN_ANGLE_LIMIT_L, 4, {mid: snapshot[mid][0] for mid in failed})
+        _eeprom_write(engine, STS_OFS_L, 2, {mid: snapshot[mid][1] for mid in failed})
+    _eeprom_write(engine, STS_MODE, 1, {mid: snapshot[mid][2] for mid in ids})
+    engine.sync_write(STS_TORQUE_LIMIT, 2, {mid: snapshot[mid][3] for mid in ids})
+    _broadcast(engine, ids, STS_LOCK, [1])
+
+
+@traced("calibration")
+def auto_calibrate(
+    controller: MotorController, motor_ids: list[int], settings: CalibrationSettings | None = None
+) -> CalibrationReport:
+    # 모든 모터를 동시에 저토크 휠 모드로 양 끝 하드 스톱까지 보내고,
+    # 중앙 보정값과 각도 제한을 동기 쓰기 몇 번으로 EEPROM에 저장한다.
+    # 중간에 실패하거나 예외가 나도 결과가 확인되지 않은 모터는 시작 전 설정으로 되돌린다.
+    s = settings or CalibrationSettings()
+    if not motor_ids:
+        raise ValueError("No motors to calibrate")
+    report = CalibrationReport()
+    results = report.results
+    start = time.monotonic()
+    with controller.bus() as engine:
+        snapshot = _snapshot(engine, motor_ids)
+        for mid in motor_ids:
+            if mid not in snapshot:
+                report.failures[mid] = "설정을 읽지 못함"
+        ids = sorted(snapshot)
+        if not ids:
+            report.elapsed = time.monotonic() - start
+            return report
+        try:
+            _broadcast(engine, ids, STS_TORQUE_ENABLE, [0])
+            _broadcast(engine, ids, STS_LOCK, [0])
+            _eeprom_write(engine, STS_OFS_L, 2, {mid: _word(0) for mid in ids})
+            _eeprom_write(engine, STS_MIN_ANGLE_LIMIT_L, 4, {mid: _word(0) + _word(4095) for mid in ids})
+            _eeprom_write(engine, STS_MODE, 1, {mid: [1] for mid in ids})
+            _broadcast(engine, ids, STS_TORQUE_LIMIT, _word(s.torque_limit))
+            # 보정값이 남아 있으면 찾은 위치에 옛 보정값이 섞이므로, 초기화가 적용된 모터만 탐색한다
+            replies = engine.sync_read(ids, STS_MIN_ANGLE_LIMIT_L, STS_MODE - STS_MIN_ANGLE_LIMIT_L + 1)
+            for mid in list(ids):
+                reply = replies.get(mid)
+                if reply is None or list(reply[1][0:4]) != _word(0) + _word(4095) or \
+                        list(reply[1][22:25]) != _word(0) + [1]:
+                    report.failures[mid] = "초기화 확인 실패"
+                    ids.remove(mid)
+            if ids:
+                _broadcast(engine, ids, STS_TORQUE_ENABLE, [1])
+                axes = _search(engine, ids, s, report)
+                _broadcast(engine, ids, STS_TORQUE_ENABLE, [0])
+            else:
+                axes = {}
+
+            for mid, axis in axes.items():
+                if mid in report.failures:
+                    continue
+                try:
+                    results[mid] = _solve(mid, axis, s)
+                except ValueError as e:
+                    report.failures[mid] = str(e)
+
+            if results:
+                _eeprom_write(engine, STS_OFS_L, 2, {
+                    mid: _signed(r.offset, 11) for mid, r in results.items()
+                })
+                _eeprom_write(engine, STS_MIN_ANGLE_LIMIT_L, 4, {
+                    mid: _word(r.min_limit) + _word(r.max_limit) for mid, r in results.items()
+                })
+                # 저장된 값을 동기 읽기 한 번으로 확인 (9~12: 각도 제한, 31~32: 보정값)
+                replies = engine.sync_read(sorted(results), STS_MIN_ANGLE_LIMIT_L, 24)
+                for mid, r in list(results.items()):
+                    reply = replies.get(mid)
+                    expected = _word(r.min_limit) + _word(r.max_limit)
+                    if reply is None or list(reply[1][0:4]) != expected or \
+                            list(reply[1][22:24]) != _signed(r.offset, 11):
+                        report.failures[mid] = "EEPROM 확인 실패"
+                        del results[mid]
+        except Exception:
+            # 예외가 난 경우 이미 확인된 결과도 신뢰하지 않고 모두 원래대로
+            results.clear()
+            raise
+        finally:
+            _restore(engine, snapshot, set(results))
+    report.elapsed = time.monotonic() - start
+    return report
@@ -0,0 +1,141 @@
+import itertools
+import struct
+import sys
+import time
+import zipfile
+from array import array
+from dataclasses import dataclass, field
+
+from st3215.values import STS_ACC, STS_PRESENT_POSITION_L
+
+from motor_controller import STATUS_BLOCK_LENGTH, MotorController, _decode_fields
+from tracing import traced
+
+# 열 이름 → array 타입 코드 (NumPy dtype으로 그대로 대응)
+COLUMNS = {
+    "time": "d",  # s, 측정 시작 기준
+    "run": "H",  # 스윕 조합 번호
+    "motor_id": "B",
+    "speed_cmd": "H",
+    "acceleration_cmd": "B",
+    "target": "H",
+    "position": "H",
+    "speed": "h",
+    "load": "h",
+    "voltage": "f",  # V
+    "temperature": "B",  # °C
+    "current": "f",  # mA
+    "moving": "B",
+    "error": "B",
+}
+
+_DTYPE_KIND = {
+    "b": "i", "h": "i", "i": "i", "l": "i", "q": "i",
+    "B": "u", "H": "u", "I": "u", "L": "u", "Q": "u",
+    "f": "f", "d": "f",
+}
+
+
+@dataclass
+class SweepPlan:
+    speeds: list[int] = field(default_factory=lambda: [500, 1000, 2000, 3000])
+    accelerations: list[int] = field(default_factory=lambda: [10, 50, 150])
+    targets: list[int] = field(default_factory=lambda: [1024, 3072, 2048])
+    move_timeout: float = 5.0  # s, 이동 한 번의 최대 측정 시간
+    settle: float = 0.1  # s, 정지 후 추가로 기록하는 시간
+    start_grace: float = 0.05  # s, 명령 직후 이동 플래그가 서기까지 기다리는 시간
+
+    @property
+    def runs(self) -> int:
+        return len(self.speeds) * len(self.accelerations) * len(self.targets)
+
+
+class ColumnarDataset:
+    # 필드마다 타입이 정해진 array 하나씩. 행 단위 객체를 만들지 않아 고속 샘플링에도 가볍다.
+
+    def __init__(self):
+        self.columns: dict[str, array] = {name: array(code) for name, code in COLUMNS.items()}
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    def save(self, path: str) -> None:
+        # 압축하지 않은 .npz: numpy.load(path)["position"] 처럼 파싱 없이 바로 읽힌다
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+            for name, column in self.columns.items():
+                zf.writestr(f"{name}.npy", _npy_header(column) + column.tobytes())
+
+
+def _npy_header(column: array) -> bytes:
+    # NPY 1.0 포맷 헤더 (magic + 길이 + dict 문자열, 64바이트 정렬)
+    if column.itemsize == 1:
+        descr = f"|{_DTYPE_KIND[column.typecode]}1"
+    else:
+        order = "<" if sys.byteorder == "little" else ">"
+        descr = f"{order}{_DTYPE_KIND[column.typecode]}{column.itemsize}"
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(column)},), }}"
+    header += " " * (63 - (10 + len(header)) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+@traced("characterization")
+def run_sweep(
+    controller: MotorController, motor_ids: list[int], plan: SweepPlan | None = None, progress=None
+) -> ColumnarDataset:
+    # 속도 × 가속도 × 목표 위치의 모든 조합으로 모터들을 동시에 움직이며,
+    # 이동하는 동안 동기 읽기로 버스가 허용하는 최대 속도로 상태를 기록한다.
+    plan = plan or SweepPlan()
+    if not motor_ids:
+        raise ValueError("No motors to characterize")
+    ds = ColumnarDataset()
+    c = ds.columns
+    ids = sorted(motor_ids)
+    t0 = time.perf_counter()
+    combos = itertools.product(plan.speeds, plan.accelerations, plan.targets)
+    for run, (speed, acc, target) in enumerate(combos):
+        # 조합 하나마다 버스를 잡아, 사이사이 다른 사용자(서버 모드 등)가 끼어들 수 있게 한다
+        with controller.bus() as engine:
+            engine.sync_write(STS_ACC, 7, {mid: [
+                acc,
+                target & 0xFF, target >> 8 & 0xFF,
+                0, 0,
+                speed & 0xFF, speed >> 8 & 0xFF,
+            ] for mid in ids})
+            start = time.perf_counter()
+            stopped_at = None
+            while True:
+                replies = engine.sync_read(ids, STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH)
+                now = time.perf_counter()
+                moving = False
+                for mid, (error, d) in replies.items():
+                    if len(d) != STATUS_BLOCK_LENGTH:
+                        continue
+                    # _decode_status와 같은 해석을 열에 바로 기록 (MotorStatus 객체 생략)
+                    position, v, load, voltage, temperature, current, is_moving = _decode_fields(d)
+                    c["time"].append(now - t0)
+                    c["run"].append(run)
+                    c["motor_id"].append(mid)
+                    c["speed_cmd"].append(speed)
+                    c["acceleration_cmd"].append(acc)
+                    c["target"].append(target)
+                    c["position"].append(position)
+                    c["speed"].append(v)
+                    c["load"].append(load)
+                    c["voltage"].append(voltage)
+                    c["temperature"].append(temperature)
+                    c["current"].append(current)
+                    c["moving"].append(is_moving)
+                    c["error"].append(error)
+                    moving = moving or is_moving
+                elapsed = now - start
+                if elapsed > plan.move_timeout:
+                    break
+                if moving or elapsed < plan.start_grace:
+                    stopped_at = None
+                elif stopped_at is None:
+                    stopped_at = now
+                elif now - stopped_at >= plan.settle:
+                    break
+        if progress:
+            progress(run + 1, plan.runs)
+    return ds
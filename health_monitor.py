@@ -0,0 +1,127 @@
+import math
+import time
+from dataclasses import dataclass, field
+
+from motor_controller import MotorStatus
+
+THERMAL_RUNAWAY = "thermal_runaway"
+OVER_TEMPERATURE = "over_temperature"
+OVER_CURRENT = "over_current"
+STALL = "stall"
+
+
+@dataclass
+class HealthThresholds:
+    max_temperature: float = 65.0  # °C
+    runaway_rate: float = 0.5  # °C/s, runaway_min_temperature 이상일 때
+    runaway_min_temperature: float = 45.0
+    max_current: float = 2000.0  # mA (EWMA 기준)
+    stall_load: float = 500.0  # |부하| (0.1% 단위 듀티)
+    stall_speed: float = 20.0  # |속도| 이하면 정지로 간주
+    stall_time: float = 1.0  # s
+
+
+@dataclass
+class HealthAlert:
+    motor_id: int
+    kind: str
+    message: str
+    value: float
+    timestamp: float = field(default_factory=time.time)
+
+
+class RollingStats:
+    # 샘플당 O(1): 시간 상수 tau의 EWMA와 변화율(dx/dt의 EWMA).
+    # 시간 기반이라 5 Hz GUI 폴링과 100 Hz 서버 폴링에서 같은 의미를 갖는다.
+    __slots__ = ("tau", "ewma", "rate", "last", "_last_t")
+
+    def __init__(self, tau: float = 1.0):
+        self.tau = tau
+        self.ewma: float | None = None
+        self.rate = 0.0
+        self.last: float | None = None
+        self._last_t = 0.0
+
+    def update(self, t: float, x: float) -> None:
+        if self.ewma is None:
+            self.ewma = x
+        else:
+            dt = t - self._last_t
+            if dt > 0:
+                a = 1.0 - math.exp(-dt / self.tau)
+                self.ewma += a * (x - self.ewma)
+                self.rate += a * ((x - self.last) / dt - self.rate)
+        self.last = x
+        self._last_t = t
+
+
+class _MotorHealth:
+    __slots__ = ("temperature", "current", "load", "stall_since", "active")
+
+    def __init__(self):
+        # 온도는 1°C 단위로 양자화되므로 변화율을 긴 시간 상수로 평활화
+        self.temperature = RollingStats(tau=10.0)
+        self.current = RollingStats(tau=0.5)
+        self.load = RollingStats(tau=0.5)
+        self.stall_since: float | None = None
+        self.active: set[str] = set()
+
+
+class HealthMonitor:
+    def __init__(self, thresholds: HealthThresholds | None = None):
+        self.thresholds = thresholds or HealthThresholds()
+        self._motors: dict[int, _MotorHealth] = {}
+
+    def update(self, motor_id: int, status: MotorStatus, t: float | None = None) -> list[HealthAlert]:
+        if t is None:
+            t = time.monotonic()
+        h = self._motors.get(motor_id)
+        if h is None:
+            h = self._motors[motor_id] = _MotorHealth()
+        th = self.thresholds
+
+        h.temperature.update(t, status.temperature)
+        h.current.update(t, status.current)
+        h.load.update(t, abs(status.load))
+
+        conditions: dict[str, tuple[bool, float]] = {}
+        temp = h.temperature.ewma
+        if temp is not None:
+            conditions[OVER_TEMPERATURE] = (temp > th.max_temperature, temp)
+            rate = h.temperature.rate
+            # 해제는 임계값의 절반 아래로 내려갈 때만 (1°C 계단마다 알림이 반복되지 않도록)
+            limit = th.runaway_rate / 2 if THERMAL_RUNAWAY in h.active else th.runaway_rate
+            conditions[THERMAL_RUNAWAY] = (
+                temp > th.runaway_min_temperature and rate > limit, rate
+            )
+        cur = h.current.ewma
+        if cur is not None:
+            conditions[OVER_CURRENT] = (cur > th.max_current, cur)
+        if h.load.ewma is not None:
+            if h.load.ewma > th.stall_load and abs(status.speed) <= th.stall_speed:
+                if h.stall_since is None:
+                    h.stall_since = t
+            else:
+                h.stall_since = None
+            stalled = h.stall_since is not None and t - h.stall_since >= th.stall_time
+            conditions[STALL] = (stalled, h.load.ewma)
+
+        alerts = []
+        for kind, (active, value) in conditions.items():
+            # 조건이 새로 발생할 때 한 번만 알리고, 해소되면 다시 알릴 수 있게 한다
+            if active and kind not in h.active:
+                h.active.add(kind)
+                alerts.append(HealthAlert(motor_id, kind, _message(kind, h), value))
+            elif not active:
+                h.active.discard(kind)
+        return alerts
+
+
+def _message(kind: str, h: _MotorHealth) -> str:
+    if kind == OVER_TEMPERATURE:
+        return f"과열: {h.temperature.ewma:.1f}°C"
+    if kind == THERMAL_RUNAWAY:
+        return f"온도 급상승: {h.temperature.rate:.2f}°C/s ({h.temperature.ewma:.1f}°C)"
+    if kind == OVER_CURRENT:
+        return f"과전류: {h.current.ewma:.0f}mA"
+    return f"스톨: 부하 {h.load.ewma:.0f}, 속도 0 유지 중"
@@ -1,17 +1,129 @@
+import argparse
+import multiprocessing
 import sys
+import time
 
-from PyQt6.QtWidgets import QApplication
+_T0 = time.perf_counter()
+STARTUP_TARGET_MS = 500
 
-from ui.main_window import MainWindow
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="STS3215 Motor Test")
+    parser.add_argument(
+        "--serve", metavar="PORT",
+        help="run headless: own the serial PORT and serve telemetry to local clients",
+    )
+    parser.add_argument(
+        "--workers", metavar="PORT", nargs="+",
+        help="monitor several buses at once, one worker process per serial PORT",
+    )
+    parser.add_argument("--ids", type=int, nargs="+", help="motor IDs to poll (default: scan)")
+    parser.add_argument("--baudrate", type=int, default=1_000_000)
+    parser.add_argument("--listen", type=int, default=8765, help="telemetry TCP port on 127.0.0.1")
+    parser.add_argument(
+        "--metrics-port", type=int,
+        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics",
+    )
+    parser.add_argument(
+        "--render", choices=["auto", "quality", "performance"], default="auto",
+        help="performance draws panels without drop-shadow effects (auto: decide from the hardware)",
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="print the time spent in each startup phase up to time-to-interactive",
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE",
+        help="record a timeline of bus and UI activity and write it as Chrome trace JSON on exit",
+    )
+    # Qt 자체 옵션(-style 등)은 그대로 QApplication에 전달
+    return parser.parse_known_args()
+
+
+class _StartupProfile:
+    # 단계별 경과 시간 (main.py 로드 시점 기준)
+    def __init__(self):
+        self._last = _T0
+        self._phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> None:
+        for phase, seconds in self._phases:
+            print(f"  {phase:<28} {seconds * 1000:7.1f} ms", file=sys.stderr)
+        total = (self._last - _T0) * 1000
+        verdict = "OK" if total <= STARTUP_TARGET_MS else f"over {STARTUP_TARGET_MS} ms target"
+        print(f"  {'time to interactive':<28} {total:7.1f} ms ({verdict})", file=sys.stderr)
+
+
+def _export_trace(path: str) -> None:
+    from tracing import tracer
+
+    count = tracer.export(path)
+    print(f"Trace written to {path} ({count} events)")
 
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_argv = _parse_args()
+    profile = _StartupProfile() if args.profile_startup else None
+    if profile:
+        profile.mark("arguments")
+    if args.trace:
+        from tracing import tracer
+
+        tracer.enable()
+
+    if args.serve:
+        from telemetry_server import run_server
+
+        code = run_server(args.serve, args.ids, args.listen, args.baudrate, args.metrics_port)
+        if args.trace:
+            _export_trace(args.trace)
+        sys.exit(code)
+
+    from PyQt6.QtWidgets import QApplication
+
+    if profile:
+        profile.mark("import Qt")
+    from ui.main_window import MainWindow, detect_render_mode, set_render_mode
+
+    if profile:
+        profile.mark("import main window")
+    set_render_mode(detect_render_mode() if args.render == "auto" else args.render)
+    app = QApplication(sys.argv[:1] + qt_argv)
     app.setStyle("Fusion")
-    window = MainWindow()
+    if profile:
+        profile.mark("QApplication")
+    metrics = None
+    if args.metrics_port:
+        from metrics_exporter import MetricsRegistry, MetricsServer
+
+        metrics = MetricsRegistry()
+        MetricsServer(metrics, args.metrics_port).start()
+    if args.workers:
+        from bus_workers import BusSupervisor
+        from ui.bus_monitor import BusMonitorWindow
+
+        supervisor = BusSupervisor(args.workers, args.baudrate, args.ids)
+        supervisor.start()
+        window = BusMonitorWindow(supervisor)
+    else:
+        window = MainWindow(metrics=metrics)
+        if profile:
+            profile.mark("build window")
+            window.first_painted.connect(lambda: profile.mark("first paint"))
+            window.ready.connect(lambda: (profile.mark("deferred panels, ports"), profile.report()))
     window.show()
-    sys.exit(app.exec())
+    code = app.exec()
+    if args.trace:
+        _export_trace(args.trace)
+    sys.exit(code)
 
 
 if __name__ == "__main__":
+    # PyInstaller 빌드에서 spawn 워커가 GUI를 다시 띄우지 않고 워커 코드만 실행하도록
+    multiprocessing.freeze_support()
     main()
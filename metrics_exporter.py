@@ -0,0 +1,133 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from motor_controller import MotorStatus
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (이름, 설명, MotorStatus 필드, 단위 환산 배율)
+_GAUGES = [
+    ("sts_motor_position_steps", "Present position (0-4095)", "position", 1),
+    ("sts_motor_speed_steps_per_second", "Present speed", "speed", 1),
+    ("sts_motor_temperature_celsius", "Internal temperature", "temperature", 1),
+    ("sts_motor_voltage_volts", "Supply voltage", "voltage", 1),
+    ("sts_motor_current_milliamps", "Motor current", "current", 1),
+    # 부하 레지스터는 0.1% 단위
+    ("sts_motor_load_percent", "Motor load", "load", 0.1),
+    ("sts_motor_moving", "1 while the motor is moving", "is_moving", 1),
+]
+
+
+@dataclass
+class _MotorMetrics:
+    values: dict[str, float] = field(default_factory=dict)
+    reads: int = 0
+    errors: int = 0
+    latency: float = 0.0
+    latency_sum: float = 0.0
+    alerts: dict[str, int] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._motors: dict[int, _MotorMetrics] = {}
+        self._updated = 0.0
+        # 스크레이프는 미리 렌더링된 본문만 읽는다 (버스/컨트롤러 락과 무관)
+        self._body = b""
+        self.publish()
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+    def observe(self, motor_id: int, status: MotorStatus, latency: float) -> None:
+        with self._lock:
+            m = self._motors.setdefault(motor_id, _MotorMetrics())
+            m.reads += 1
+            m.latency = latency
+            m.latency_sum += latency
+            for _, _, attr, scale in _GAUGES:
+                m.values[attr] = float(getattr(status, attr)) * scale
+            self._updated = time.time()
+
+    def observe_error(self, motor_id: int, latency: float) -> None:
+        with self._lock:
+            m = self._motors.setdefault(motor_id, _MotorMetrics())
+            m.reads += 1
+            m.errors += 1
+            m.latency = latency
+            m.latency_sum += latency
+            self._updated = time.time()
+
+    def observe_alert(self, motor_id: int, kind: str) -> None:
+        with self._lock:
+            m = self._motors.setdefault(motor_id, _MotorMetrics())
+            m.alerts[kind] = m.alerts.get(kind, 0) + 1
+
+    def publish(self) -> None:
+        with self._lock:
+            motors = sorted(self._motors.items())
+            lines = []
+            for name, help_text, attr, _ in _GAUGES:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                for mid, m in motors:
+                    if attr in m.values:
+                        lines.append(f'{name}{{motor_id="{mid}"}} {m.values[attr]:g}')
+            for name, kind, help_text, getter in [
+                ("sts_reads_total", "counter", "Status reads attempted", lambda m: m.reads),
+                ("sts_read_errors_total", "counter", "Status reads that failed", lambda m: m.errors),
+                ("sts_bus_latency_seconds", "gauge", "Latency of the last status read", lambda m: m.latency),
+                ("sts_bus_latency_seconds_total", "counter", "Total status read latency", lambda m: m.latency_sum),
+            ]:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for mid, m in motors:
+                    lines.append(f'{name}{{motor_id="{mid}"}} {getter(m):g}')
+            lines.append("# HELP sts_health_alerts_total Health alerts raised")
+            lines.append("# TYPE sts_health_alerts_total counter")
+            for mid, m in motors:
+                for kind, count in sorted(m.alerts.items()):
+                    lines.append(f'sts_health_alerts_total{{motor_id="{mid}",kind="{kind}"}} {count}')
+            lines.append("# HELP sts_last_update_timestamp_seconds Time of the last telemetry sample")
+            lines.append("# TYPE sts_last_update_timestamp_seconds gauge")
+            lines.append(f"sts_last_update_timestamp_seconds {self._updated:.3f}")
+            self._body = ("\n".join(lines) + "\n").encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MetricsServer"
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.body
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1"):
+        self.registry = registry
+        super().__init__((host, port), _Handler)
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
@@ -1,7 +1,41 @@
-import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 from st3215 import ST3215
+from st3215.values import (
+    BROADCAST_ID,
+    DEFAULT_BAUDRATE,
+    INST_PING,
+    STS_ACC,
+    STS_BAUD_RATE,
+    STS_ID,
+    STS_LOCK,
+    STS_MODE,
+    STS_PRESENT_POSITION_L,
+    STS_TORQUE_ENABLE,
+)
+
+from sts_protocol import CommError, PacketEngine
+from tracing import TracedLock, traced
+
+# EPROM RW (st3215.values에 없는 레지스터)
+STS_RETURN_DELAY = 7
+STS_STATUS_RETURN_LEVEL = 8
+
+# baud → STS_BAUD_RATE 레지스터 값 (빠른 순)
+BAUD_RATES = {
+    1_000_000: 0,
+    500_000: 1,
+    250_000: 2,
+    128_000: 3,
+    115_200: 4,
+    76_800: 5,
+    57_600: 6,
+    38_400: 7,
+}
 
 
 @dataclass
@@ -13,92 +47,582 @@ class MotorStatus:
     current: float = 0.0
     load: int = 0
     is_moving: bool = False
+    error: int = 0  # 상태 패킷의 에러 비트 (ERRBIT_*)
+
+
+# 현재 위치(56) ~ 현재 전류(70)를 한 번에 읽는다
+STATUS_BLOCK_LENGTH = 15
+MAX_MOTOR_ID = 253
+# EEPROM 쓰기가 끝날 때까지 기다리는 시간
+EEPROM_WRITE_DELAY = 0.01
+
+# 펌웨어 버전(0) ~ EEPROM 끝(39): 모델과 설정 지문을 한 번에 읽는다
+EEPROM_LENGTH = 40
+
+
+def _decode_fields(d: memoryview) -> tuple[int, int, int, float, int, float, bool]:
+    # 상태 블록(56~70)의 부호/단위 변환을 한 곳에서: 위치, 속도, 부하, 전압, 온도, 전류, 이동 중
+    speed = d[2] | d[3] << 8
+    if speed & 0x8000:
+        speed = -(speed & 0x7FFF)
+    load = d[4] | d[5] << 8
+    if load & 0x400:
+        load = -(load & 0x3FF)
+    current = ((d[13] | d[14] << 8) & 0x7FFF) * 6.5
+    return d[0] | d[1] << 8, speed, load, d[6] * 0.1, d[7], current, bool(d[10])
+
+
+def _decode_status(error: int, d: memoryview) -> MotorStatus:
+    position, speed, load, voltage, temperature, current, moving = _decode_fields(d)
+    return MotorStatus(
+        position=position,
+        speed=speed,
+        temperature=temperature,
+        voltage=voltage,
+        current=current,
+        load=load,
+        is_moving=moving,
+        error=error,
+    )
+
+
+@dataclass
+class BaudUpgradeResult:
+    old_baudrate: int
+    new_baudrate: int
+    throughput_before: float
+    throughput_after: float
+
+
+@dataclass
+class ProtocolBenchmark:
+    motor_count: int
+    # 초당 읽은 모터 상태 수
+    legacy_status_rate: float  # st3215 헬퍼: 상태 1회 = 트랜잭션 7회
+    engine_status_rate: float  # PacketEngine 블록 읽기: 상태 1회 = 트랜잭션 1회
+    sync_status_rate: float  # PacketEngine 동기 읽기: 모든 모터 상태 = 트랜잭션 1회
+
+    @property
+    def legacy_tps(self) -> float:
+        return self.legacy_status_rate * 7
+
+    @property
+    def engine_tps(self) -> float:
+        return self.engine_status_rate
+
+    @property
+    def sync_tps(self) -> float:
+        return self.sync_status_rate / self.motor_count
+
+
+@dataclass(frozen=True)
+class MotorIdentity:
+    model: int
+    firmware: str
+    fingerprint: str  # EEPROM 0~39의 CRC32 (ID, 보드레이트, 제한값, 보정값 등 설정이 바뀌면 달라짐)
+
+
+@dataclass
+class BusTuning:
+    return_delay: int  # 2 µs 단위
+    status_return_level: int  # 0: 읽기/핑만 응답, 1: 모든 명령에 응답
+
+
+@dataclass
+class BusTuningReport:
+    write_latency_before: float  # ms / 트랜잭션
+    write_latency_after: float
+    read_latency_before: float
+    read_latency_after: float
+
+
+def _remap_steps(moves: dict[int, int], spares: list[int]) -> list[tuple[int, int]]:
+    # 새 ID가 비어 있는 이동부터 실행하고, 순환만 남으면 하나를 임시 ID로 옮겨 순환을 끊는다
+    pending = dict(moves)
+    occupied = set(moves)
+    steps = []
+    while pending:
+        ready = [(cur, new) for cur, new in pending.items() if new not in occupied]
+        if not ready:
+            if not spares:
+                raise RuntimeError("No free ID left to break an ID cycle")
+            cur, new = next(iter(pending.items()))
+            temp = spares.pop(0)
+            steps.append((cur, temp))
+            occupied.discard(cur)
+            occupied.add(temp)
+            del pending[cur]
+            pending[temp] = new
+            continue
+        for cur, new in ready:
+            steps.append((cur, new))
+            occupied.discard(cur)
+            occupied.add(new)
+            del pending[cur]
+    return steps
 
 
 class MotorController:
     def __init__(self):
         self._servo: ST3215 | None = None
-        self._lock = threading.Lock()
+        self._engine: PacketEngine | None = None
+        self._lock = TracedLock("MotorController._lock")
         self._connected = False
+        self._port: str | None = None
+        self._baudrate = DEFAULT_BAUDRATE
+        # 쓰기 응답을 끈 모터(status return level 0)는 응답을 기다리지 않고 보낸다
+        self._no_ack: set[int] = set()
 
     @property
     def connected(self) -> bool:
         return self._connected
 
-    def connect(self, port: str) -> None:
+    @property
+    def port(self) -> str | None:
+        return self._port
+
+    @property
+    def baudrate(self) -> int:
+        return self._baudrate
+
+    @traced("bus")
+    def connect(self, port: str, baudrate: int = DEFAULT_BAUDRATE) -> None:
         with self._lock:
+            self._close()
             self._servo = ST3215(port)
+            self._engine = PacketEngine(self._servo.portHandler)
+            self._port = port
             self._connected = True
+            if baudrate != DEFAULT_BAUDRATE:
+                self._set_port_baudrate(baudrate)
+            self._baudrate = baudrate
+
+    @contextmanager
+    def bus(self) -> Iterator[PacketEngine]:
+        # 여러 트랜잭션으로 이루어진 작업(캘리브레이션 등)이 버스를 독점할 때 사용
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            yield self._engine
 
+    @traced("bus")
     def disconnect(self) -> None:
         with self._lock:
-            self._servo = None
-            self._connected = False
+            self._close()
 
-    def scan_motors(self, id_range: range = range(1, 30)) -> list[int]:
+    def _close(self) -> None:
+        if self._servo:
+            try:
+                self._servo.portHandler.closePort()
+            except Exception:
+                pass
+        self._servo = None
+        self._engine = None
+        self._port = None
+        self._connected = False
+        self._baudrate = DEFAULT_BAUDRATE
+        self._no_ack.clear()
+
+    def _set_port_baudrate(self, baudrate: int) -> None:
+        handler = self._servo.portHandler
+        handler.baudrate = baudrate
+        handler.setupPort()
+        self._baudrate = baudrate
+
+    def _scan(self, id_range: range) -> list[int]:
         found = []
+        for motor_id in id_range:
+            try:
+                if self._servo.PingServo(motor_id):
+                    found.append(motor_id)
+                    self._learn_ack(motor_id)
+            except Exception:
+                continue
+        return found
+
+    def _learn_ack(self, motor_id: int) -> None:
+        try:
+            self._read_tuning(motor_id)
+        except RuntimeError:
+            pass
+
+    @traced("bus")
+    def scan_motors(self, id_range: range = range(1, 30)) -> list[int]:
         with self._lock:
             if not self._servo:
-                return found
-            for motor_id in id_range:
-                try:
-                    if self._servo.PingServo(motor_id):
-                        found.append(motor_id)
-                except Exception:
-                    continue
+                return []
+            return self._scan(id_range)
+
+    def _probe_bus(self, window: float = 0.02) -> bool:
+        # 브로드캐스트 핑: 응답이 충돌해도 ID가 유효한 헤더가 하나라도 오면 모터가 있는 속도
+        ser = self._servo.portHandler.ser
+        packet = bytearray([0xFF, 0xFF, BROADCAST_ID, 2, INST_PING, 0])
+        packet[5] = ~sum(packet[2:5]) & 0xFF
+        ser.reset_input_buffer()
+        ser.write(packet)
+        time.sleep(window)
+        data = ser.read(ser.in_waiting)
+        idx = data.find(b"\xff\xff")
+        while 0 <= idx < len(data) - 2:
+            # 에코 어댑터는 보낸 패킷(ID 0xFE)을 그대로 돌려주므로 제외
+            if data[idx + 2] < BROADCAST_ID - 1:
+                return True
+            idx = data.find(b"\xff\xff", idx + 1)
+        return False
+
+    @traced("bus")
+    def detect_baudrates(self, id_range: range = range(1, 30)) -> dict[int, list[int]]:
+        # 반환: {baud: [모터 ID]} — 포트는 모터가 가장 많은 속도(없으면 원래 속도)로 둔다
+        found: dict[int, list[int]] = {}
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            original = self._baudrate
+            for baudrate in BAUD_RATES:
+                self._set_port_baudrate(baudrate)
+                if self._probe_bus():
+                    ids = self._scan(id_range)
+                    if ids:
+                        found[baudrate] = ids
+            best = max(found, key=lambda b: len(found[b]), default=original)
+            self._set_port_baudrate(best)
         return found
 
+    def _read_ok(self, motor_id: int) -> bool:
+        # 통신 신뢰성만 본다: 체크섬이 맞는 응답이면 성공.
+        # 에러 바이트의 전압/과부하 등 상태 비트는 버스 오류가 아니다.
+        try:
+            self._engine.read(motor_id, STS_PRESENT_POSITION_L, 2)
+        except CommError:
+            return False
+        return True
+
+    def _measure_throughput(self, motor_ids: list[int], duration: float) -> float:
+        count = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        while time.perf_counter() < deadline:
+            for motor_id in motor_ids:
+                if self._read_ok(motor_id):
+                    count += 1
+        return count / (time.perf_counter() - start)
+
+    def _verify_bus(self, motor_ids: list[int], trials: int) -> bool:
+        return all(self._read_ok(mid) for _ in range(trials) for mid in motor_ids)
+
+    def _write_bus_baudrate(self, motor_ids: list[int], baudrate: int) -> None:
+        # 모터는 쓰기 직후 새 속도로 전환하므로 응답을 기다리지 않고, 잠금은 새 속도에서 수행
+        for motor_id in motor_ids:
+            self._engine.write(motor_id, STS_LOCK, [0], ack=False)
+            self._engine.write(motor_id, STS_BAUD_RATE, [BAUD_RATES[baudrate]], ack=False)
+        time.sleep(0.05)
+        self._set_port_baudrate(baudrate)
+        for motor_id in motor_ids:
+            self._engine.write(motor_id, STS_LOCK, [1], ack=False)
+
+    @traced("bus")
+    def upgrade_baudrate(
+        self, motor_ids: list[int], trials: int = 50, duration: float = 0.5
+    ) -> BaudUpgradeResult:
+        # 빠른 속도부터 시도하고, 한 모터라도 응답이 없으면 원래 속도로 되돌려 확인 후 다음 후보로
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            if not motor_ids:
+                raise ValueError("No motors to upgrade")
+            original = self._baudrate
+            before = self._measure_throughput(motor_ids, duration)
+            for baudrate in BAUD_RATES:
+                if baudrate <= original:
+                    break
+                self._write_bus_baudrate(motor_ids, baudrate)
+                if self._verify_bus(motor_ids, trials):
+                    after = self._measure_throughput(motor_ids, duration)
+                    return BaudUpgradeResult(original, baudrate, before, after)
+                self._write_bus_baudrate(motor_ids, original)
+                if not self._verify_bus(motor_ids, 1):
+                    raise RuntimeError(f"Motors lost after fallback to {original} baud")
+            return BaudUpgradeResult(original, original, before, before)
+
+    def _write(self, motor_id: int, address: int, data: list[int]) -> None:
+        self._engine.write(motor_id, address, data, ack=motor_id not in self._no_ack)
+
+    def _read_tuning(self, motor_id: int) -> BusTuning:
+        _, data = self._engine.read(motor_id, STS_RETURN_DELAY, 2)
+        tuning = BusTuning(return_delay=data[0], status_return_level=data[1])
+        if tuning.status_return_level == 0:
+            self._no_ack.add(motor_id)
+        else:
+            self._no_ack.discard(motor_id)
+        return tuning
+
+    @traced("bus")
+    def read_bus_tuning(self, motor_ids: list[int]) -> dict[int, BusTuning]:
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            return {mid: self._read_tuning(mid) for mid in motor_ids}
+
+    @traced("bus")
+    def read_identities(self, motor_ids: list[int]) -> dict[int, MotorIdentity]:
+        # 동기 읽기 한 번으로 모터별 모델/펌웨어/설정 지문을 읽는다. 응답이 없는 모터는 빠진다.
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            replies = self._engine.sync_read(motor_ids, 0, EEPROM_LENGTH)
+            identities = {}
+            for mid, (_, data) in replies.items():
+                if len(data) != EEPROM_LENGTH:
+                    continue
+                # 스캔 없이 연결한 경우에도 쓰기 응답을 끈 모터를 알 수 있도록
+                if data[STS_STATUS_RETURN_LEVEL] == 0:
+                    self._no_ack.add(mid)
+                else:
+                    self._no_ack.discard(mid)
+                identities[mid] = MotorIdentity(
+                    model=data[3] | data[4] << 8,
+                    firmware=f"{data[0]}.{data[1]}",
+                    fingerprint=f"{zlib.crc32(data):08x}",
+                )
+            return identities
+
+    def _measure_latency(self, motor_ids: list[int], rounds: int) -> tuple[float, float]:
+        # 잠금 레지스터에 이미 잠긴 값(1)을 다시 써서 상태를 바꾸지 않는 쓰기로 측정
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for motor_id in motor_ids:
+                self._write(motor_id, STS_LOCK, [1])
+        write_ms = (time.perf_counter() - start) * 1000 / (rounds * len(motor_ids))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for motor_id in motor_ids:
+                self._read_ok(motor_id)
+        read_ms = (time.perf_counter() - start) * 1000 / (rounds * len(motor_ids))
+        return write_ms, read_ms
+
+    @traced("bus")
+    def tune_bus(
+        self, motor_ids: list[int], return_delay: int, status_return_level: int, rounds: int = 20
+    ) -> BusTuningReport:
+        if not 0 <= return_delay <= 254:
+            raise ValueError("return_delay must be between 0 and 254")
+        if status_return_level not in (0, 1):
+            raise ValueError("status_return_level must be 0 or 1")
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            if not motor_ids:
+                raise ValueError("No motors to tune")
+            for motor_id in motor_ids:
+                self._read_tuning(motor_id)
+            write_before, read_before = self._measure_latency(motor_ids, rounds)
+            for motor_id in motor_ids:
+                self._engine.write(motor_id, STS_LOCK, [0], ack=False)
+                self._engine.write(
+                    motor_id, STS_RETURN_DELAY, [return_delay, status_return_level], ack=False
+                )
+                self._engine.write(motor_id, STS_LOCK, [1], ack=False)
+            for motor_id in motor_ids:
+                tuning = self._read_tuning(motor_id)
+                if tuning != BusTuning(return_delay, status_return_level):
+                    raise RuntimeError(f"ID {motor_id}: tuning not applied ({tuning})")
+            write_after, read_after = self._measure_latency(motor_ids, rounds)
+            return BusTuningReport(write_before, write_after, read_before, read_after)
+
+    @traced("bus")
     def ping(self, motor_id: int) -> bool:
         with self._lock:
             if not self._servo:
                 return False
             try:
-                return bool(self._servo.PingServo(motor_id))
+                found = bool(self._servo.PingServo(motor_id))
             except Exception:
                 return False
+            if found:
+                self._learn_ack(motor_id)
+            return found
 
+    @traced("bus")
     def move_to(self, motor_id: int, position: int, speed: int = 1000, acceleration: int = 50) -> None:
         with self._lock:
             if not self._servo:
                 raise ConnectionError("Not connected")
-            self._servo.SetSpeed(motor_id, speed)
-            self._servo.SetAcceleration(motor_id, acceleration)
-            self._servo.MoveTo(motor_id, position)
+            # 휠/스텝 모드로 남아 있는 모터도 움직이도록 위치 모드(0)로 먼저 전환 (ST3215.MoveTo와 같음)
+            self._write(motor_id, STS_MODE, [0])
+            # 가속도(41) ~ 목표 속도(47)를 한 번의 쓰기로 전송
+            self._write(motor_id, STS_ACC, [
+                acceleration,
+                position & 0xFF, position >> 8 & 0xFF,
+                0, 0,
+                speed & 0xFF, speed >> 8 & 0xFF,
+            ])
 
+    @traced("bus")
     def read_status(self, motor_id: int) -> MotorStatus:
         with self._lock:
             if not self._servo:
                 raise ConnectionError("Not connected")
-            s = self._servo
-            return MotorStatus(
-                position=s.ReadPosition(motor_id),
-                speed=s.ReadSpeed(motor_id),
-                temperature=s.ReadTemperature(motor_id),
-                voltage=s.ReadVoltage(motor_id),
-                current=s.ReadCurrent(motor_id),
-                load=s.ReadLoad(motor_id),
-                is_moving=s.IsMoving(motor_id),
+            return _decode_status(
+                *self._engine.read(motor_id, STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH)
             )
 
+    @traced("bus")
+    def read_status_many(self, motor_ids: list[int]) -> dict[int, MotorStatus]:
+        # 동기 읽기 한 번으로 모든 모터 상태를 읽는다. 응답이 없는 모터는 결과에서 빠진다.
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            replies = self._engine.sync_read(motor_ids, STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH)
+            return {
+                mid: _decode_status(error, data)
+                for mid, (error, data) in replies.items()
+                if len(data) == STATUS_BLOCK_LENGTH
+            }
+
+    def _read_status_legacy(self, motor_id: int) -> MotorStatus:
+        s = self._servo
+        return MotorStatus(
+            position=s.ReadPosition(motor_id),
+            speed=s.ReadSpeed(motor_id),
+            temperature=s.ReadTemperature(motor_id),
+            voltage=s.ReadVoltage(motor_id),
+            current=s.ReadCurrent(motor_id),
+            load=s.ReadLoad(motor_id),
+            is_moving=s.IsMoving(motor_id),
+        )
+
+    @traced("bus")
+    def benchmark_protocol(self, motor_ids: list[int], duration: float = 1.0) -> ProtocolBenchmark:
+        def rate(read_once) -> float:
+            count = 0
+            start = time.perf_counter()
+            deadline = start + duration
+            while time.perf_counter() < deadline:
+                count += read_once()
+            return count / (time.perf_counter() - start)
+
+        def legacy() -> int:
+            for mid in motor_ids:
+                self._read_status_legacy(mid)
+            return len(motor_ids)
+
+        def engine() -> int:
+            for mid in motor_ids:
+                self._engine.read(mid, STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH)
+            return len(motor_ids)
+
+        def sync() -> int:
+            return len(self._engine.sync_read(motor_ids, STS_PRESENT_POSITION_L, STATUS_BLOCK_LENGTH))
+
+        with self._lock:
+            if not self._servo:
+                raise ConnectionError("Not connected")
+            if not motor_ids:
+                raise ValueError("No motors to benchmark")
+            return ProtocolBenchmark(len(motor_ids), rate(legacy), rate(engine), rate(sync))
+
+    @traced("bus")
     def stop(self, motor_id: int) -> None:
         with self._lock:
             if not self._servo:
                 raise ConnectionError("Not connected")
-            self._servo.StopServo(motor_id)
+            self._write(motor_id, STS_TORQUE_ENABLE, [0])
 
+    @traced("bus")
     def set_torque(self, motor_id: int, enable: bool) -> None:
         with self._lock:
             if not self._servo:
                 raise ConnectionError("Not connected")
-            if enable:
-                self._servo.StartServo(motor_id)
-            else:
-                self._servo.StopServo(motor_id)
+            self._write(motor_id, STS_TORQUE_ENABLE, [1 if enable else 0])
 
+    @traced("bus")
     def change_id(self, current_id: int, new_id: int) -> None:
+        self.remap_ids({current_id: new_id})
+
+    @traced("bus")
+    def remap_ids(self, plan: dict[int, int]) -> list[tuple[int, int]]:
+        # {현재 ID: 새 ID} 전체를 한 트랜잭션으로 적용한다. 교환/순환은 임시 ID를 거치고,
+        # 모터마다 EEPROM 잠금 해제/잠금은 한 번씩, 결과는 동기 읽기 한 번으로 확인한다.
+        # 실패하면 실행한 단계를 거꾸로 되돌린 뒤 RuntimeError를 올린다. 반환값: 실행한 (이전, 새) 단계
+        moves = {old: new for old, new in plan.items() if old != new}
+        for motor_id in (*moves, *moves.values()):
+            if not 0 <= motor_id <= MAX_MOTOR_ID:
+                raise ValueError(f"ID {motor_id} is not between 0 and {MAX_MOTOR_ID}")
+        if len(set(moves.values())) != len(moves):
+            raise ValueError("Two motors cannot get the same new ID")
+        if not moves:
+            return []
         with self._lock:
             if not self._servo:
                 raise ConnectionError("Not connected")
-            result = self._servo.ChangeId(current_id, new_id)
-            if result is not None:
-                raise RuntimeError(str(result))
+            sources = set(moves)
+            targets = set(moves.values())
+            # 순환 하나에 임시 ID 하나 (순환은 최대 len(moves) // 2개)
+            spares = [i for i in range(MAX_MOTOR_ID, -1, -1) if i not in sources | targets]
+            spares = spares[:len(moves) // 2 + 1]
+            # 옮길 모터는 모두 응답하고, 비워 둘 ID(새 ID, 임시 ID)는 아무도 쓰지 않아야 한다
+            present = self._engine.sync_read(sorted(sources | targets | set(spares)), STS_ID, 1)
+            missing = sources - set(present)
+            if missing:
+                raise RuntimeError(f"Motors not found: {sorted(missing)}")
+            taken = (targets - sources) & set(present)
+            if taken:
+                raise RuntimeError(f"ID already in use by another motor: {sorted(taken)}")
+            spares = [i for i in spares if i not in present]
+
+            steps = _remap_steps(moves, spares)
+            done: list[tuple[int, int]] = []
+            try:
+                self._engine.sync_write(STS_LOCK, 1, {mid: [0] for mid in sorted(sources)})
+                for old, new in steps:
+                    if new in sources:
+                        # 쓰기 하나가 유실되면 같은 ID에 모터 두 개가 생기므로, 비었는지 먼저 확인
+                        self._ensure_vacated(new)
+                    done.append((old, new))
+                    self._engine.write(old, STS_ID, [new], ack=False)
+                    time.sleep(EEPROM_WRITE_DELAY)
+                self._engine.sync_write(STS_LOCK, 1, {mid: [1] for mid in sorted(targets)})
+                time.sleep(EEPROM_WRITE_DELAY)
+                self._verify_ids(targets, sources - targets)
+            except Exception as e:
+                reason = str(e) or type(e).__name__
+                try:
+                    self._rollback_ids(done, sources)
+                except Exception as rollback_error:
+                    raise RuntimeError(
+                        f"ID remap failed ({reason}) and rollback failed ({rollback_error}) — rescan the bus"
+                    ) from e
+                raise RuntimeError(f"ID remap failed ({reason}); original IDs restored") from e
+            self._no_ack = {moves.get(mid, mid) for mid in self._no_ack}
+            return steps
+
+    def _ensure_vacated(self, motor_id: int) -> None:
+        try:
+            self._engine.ping(motor_id)
+        except CommError:
+            return
+        raise RuntimeError(f"ID {motor_id} was not vacated")
+
+    def _verify_ids(self, expected: set[int], vacated: set[int]) -> None:
+        replies = self._engine.sync_read(sorted(expected | vacated), STS_ID, 1)
+        wrong = sorted(mid for mid in expected if mid not in replies or replies[mid][1][0] != mid)
+        if wrong:
+            raise RuntimeError(f"No motor answers at ID {wrong}")
+        stale = sorted(vacated & set(replies))
+        if stale:
+            raise RuntimeError(f"A motor still answers at ID {stale}")
+
+    def _rollback_ids(self, done: list[tuple[int, int]], original: set[int]) -> None:
+        # 실행한 단계를 거꾸로 되돌린다. 마지막 단계는 적용됐는지 알 수 없으므로 새 ID에서 응답할 때만.
+        involved = {i for step in done for i in step} | original
+        self._engine.sync_write(STS_LOCK, 1, {mid: [0] for mid in sorted(involved)})
+        for old, new in reversed(done):
+            try:
+                self._engine.ping(new)
+            except CommError:
+                continue
+            self._engine.write(new, STS_ID, [old], ack=False)
+            time.sleep(EEPROM_WRITE_DELAY)
+        self._engine.sync_write(STS_LOCK, 1, {mid: [1] for mid in sorted(original)})
+        time.sleep(EEPROM_WRITE_DELAY)
+        self._verify_ids(original, set())
@@ -0,0 +1,170 @@
+import time
+
+from st3215.port_handler import PortHandler
+from st3215.values import (
+    BROADCAST_ID,
+    INST_PING,
+    INST_READ,
+    INST_SYNC_READ,
+    INST_SYNC_WRITE,
+    INST_WRITE,
+)
+
+HEADER = b"\xff\xff"
+TX_BUFFER_SIZE = 256
+RX_BUFFER_SIZE = 4096
+# USB 시리얼 어댑터 지연(latency timer)을 감안한 응답 대기 여유
+RESPONSE_MARGIN = 0.02
+
+
+class CommError(RuntimeError):
+    pass
+
+
+class PacketEngine:
+    # 미리 할당한 송수신 버퍼에 패킷을 조립하고, 체크섬은 memoryview 위에서 바로 계산한다.
+    # 여러 모터의 응답은 한 번의 대량 읽기로 받아 도착하는 대로 점진적으로 파싱한다.
+    # 호출자(MotorController)가 버스 락을 잡고 있어야 한다.
+
+    def __init__(self, port_handler: PortHandler):
+        self._port = port_handler
+        self._tx = bytearray(TX_BUFFER_SIZE)
+        self._txv = memoryview(self._tx)
+        self._rx = bytearray(RX_BUFFER_SIZE)
+        self._rxv = memoryview(self._rx)
+
+    # ── Framing ──
+
+    def _frame(self, motor_id: int, instruction: int, n: int) -> int:
+        # 파라미터 n바이트는 호출자가 이미 tx[5:]에 써 두었고, 헤더와 체크섬만 채운다
+        tx = self._tx
+        tx[0] = 0xFF
+        tx[1] = 0xFF
+        tx[2] = motor_id
+        tx[3] = n + 2
+        tx[4] = instruction
+        end = 5 + n
+        tx[end] = ~sum(self._txv[2:end]) & 0xFF
+        return end + 1
+
+    def _send(self, length: int) -> None:
+        ser = self._port.ser
+        ser.reset_input_buffer()
+        if ser.write(self._txv[:length]) != length:
+            raise CommError("Failed transmit instruction packet")
+
+    def _byte_time(self) -> float:
+        return 10.0 / self._port.baudrate
+
+    # ── Receive ──
+
+    def _receive(self, ids: list[int], data_length: int, tx_length: int) -> dict[int, tuple[int, memoryview]]:
+        # 도착한 바이트부터 바로 패킷 단위로 해석한다. 앞에 잡음이 끼어 있을 수 있으므로
+        # 기대 길이에서 멈추지 않고, 원하는 응답을 모두 찾거나 기한이 지날 때까지 읽는다.
+        expected = len(ids) * (6 + data_length)
+        if expected > RX_BUFFER_SIZE:
+            raise ValueError("Response does not fit the receive buffer")
+        deadline = time.perf_counter() + (tx_length + expected) * self._byte_time() + RESPONSE_MARGIN
+        ser = self._port.ser
+        rxv = self._rxv
+        wanted = set(ids)
+        result: dict[int, tuple[int, memoryview]] = {}
+        filled = 0
+        pos = 0
+        while wanted and filled < RX_BUFFER_SIZE:
+            got = ser.readinto(rxv[filled:])
+            if got:
+                filled += got
+                pos = self._parse(pos, filled, wanted, result, data_length + 2)
+            elif time.perf_counter() > deadline:
+                break
+            else:
+                time.sleep(0.0002)
+        return result
+
+    def _parse(self, pos: int, end: int, wanted: set[int], result: dict, max_length: int) -> int:
+        rx = self._rx
+        rxv = self._rxv
+        while True:
+            i = rx.find(HEADER, pos, end)
+            if i < 0 or i + 4 > end:
+                # 헤더 일부만 도착했을 수 있으므로 마지막 바이트부터 다시 확인
+                return max(pos, end - 1) if i < 0 else i
+            motor_id = rx[i + 2]
+            length = rx[i + 3]
+            # 기대보다 긴 길이는 잡음: 믿고 기다리면 뒤의 실제 응답을 모두 놓친다
+            if motor_id > 0xFD or not 2 <= length <= max_length:
+                pos = i + 1
+                continue
+            last = i + 3 + length
+            if last >= end:
+                return i
+            if rx[last] != ~sum(rxv[i + 2:last]) & 0xFF or motor_id not in wanted:
+                pos = i + 1
+                continue
+            result[motor_id] = (rx[i + 4], rxv[i + 5:last])
+            wanted.discard(motor_id)
+            pos = last + 1
+
+    # ── Transactions ──
+
+    def ping(self, motor_id: int) -> int:
+        self._send(self._frame(motor_id, INST_PING, 0))
+        reply = self._receive([motor_id], 0, 6)
+        if motor_id not in reply:
+            raise CommError(f"ID {motor_id}: no status packet")
+        return reply[motor_id][0]
+
+    def read(self, motor_id: int, address: int, length: int) -> tuple[int, memoryview]:
+        self._tx[5] = address
+        self._tx[6] = length
+        tx_length = self._frame(motor_id, INST_READ, 2)
+        self._send(tx_length)
+        reply = self._receive([motor_id], length, tx_length)
+        if motor_id not in reply:
+            raise CommError(f"ID {motor_id}: no status packet")
+        error, data = reply[motor_id]
+        if len(data) != length:
+            raise CommError(f"ID {motor_id}: short read")
+        return error, data
+
+    def write(self, motor_id: int, address: int, data: bytes | bytearray | list[int], ack: bool = True) -> int:
+        n = len(data)
+        if n + 7 > TX_BUFFER_SIZE:
+            raise ValueError("Write does not fit the transmit buffer")
+        self._tx[5] = address
+        self._tx[6:6 + n] = data
+        tx_length = self._frame(motor_id, INST_WRITE, n + 1)
+        self._send(tx_length)
+        if not ack or motor_id == BROADCAST_ID:
+            return 0
+        reply = self._receive([motor_id], 0, tx_length)
+        if motor_id not in reply:
+            raise CommError(f"ID {motor_id}: no status packet")
+        return reply[motor_id][0]
+
+    def sync_read(self, motor_ids: list[int], address: int, length: int) -> dict[int, tuple[int, memoryview]]:
+        # 응답하지 않은 모터는 결과에서 빠진다 (호출자가 판단)
+        tx = self._tx
+        n = len(motor_ids)
+        tx[5] = address
+        tx[6] = length
+        tx[7:7 + n] = bytes(motor_ids)
+        tx_length = self._frame(BROADCAST_ID, INST_SYNC_READ, n + 2)
+        self._send(tx_length)
+        return self._receive(list(motor_ids), length, tx_length)
+
+    def sync_write(self, address: int, length: int, data: dict[int, bytes | bytearray | list[int]]) -> None:
+        if 8 + len(data) * (1 + length) > TX_BUFFER_SIZE:
+            raise ValueError("Sync write does not fit the transmit buffer")
+        tx = self._tx
+        tx[5] = address
+        tx[6] = length
+        i = 7
+        for motor_id, values in data.items():
+            if len(values) != length:
+                raise ValueError(f"ID {motor_id}: expected {length} bytes")
+            tx[i] = motor_id
+            tx[i + 1:i + 1 + length] = values
+            i += 1 + length
+        self._send(self._frame(BROADCAST_ID, INST_SYNC_WRITE, i - 5))
@@ -0,0 +1,295 @@
+import json
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from dataclasses import asdict
+
+from health_monitor import HealthMonitor
+from metrics_exporter import MetricsRegistry, MetricsServer
+from motor_controller import DEFAULT_BAUDRATE, MotorController, MotorStatus
+
+DEFAULT_LISTEN_PORT = 8765
+
+# 클라이언트가 큐에 넣을 수 있는 명령 → MotorController 메서드
+COMMANDS = {
+    "move_to": ("motor_id", "position", "speed", "acceleration"),
+    "stop": ("motor_id",),
+    "set_torque": ("motor_id", "enable"),
+    "ping": ("motor_id",),
+}
+
+
+def status_to_dict(status: MotorStatus) -> dict:
+    return asdict(status)
+
+
+class _Subscriber:
+    def __init__(self, maxsize: int = 64):
+        self.outbox: queue.Queue[bytes | None] = queue.Queue(maxsize)
+
+    def send(self, line: bytes) -> None:
+        # 느린 클라이언트는 오래된 프레임부터 버려 폴링 루프를 막지 않는다
+        while True:
+            try:
+                self.outbox.put_nowait(line)
+                return
+            except queue.Full:
+                try:
+                    self.outbox.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_ThreadingServer"
+
+    def handle(self):
+        telemetry = self.server.telemetry
+        sub = _Subscriber()
+        telemetry._add_subscriber(sub)
+        reader = threading.Thread(target=self._read_commands, args=(sub,), daemon=True)
+        reader.start()
+        try:
+            while True:
+                line = sub.outbox.get()
+                if line is None:
+                    break
+                self.wfile.write(line)
+        except OSError:
+            pass
+        finally:
+            telemetry._remove_subscriber(sub)
+
+    def _read_commands(self, sub: _Subscriber):
+        try:
+            for raw in self.rfile:
+                try:
+                    request = json.loads(raw)
+                except ValueError:
+                    sub.send(_encode({"type": "result", "ok": False, "error": "invalid JSON"}))
+                    continue
+                if not isinstance(request, dict):
+                    sub.send(_encode({"type": "result", "ok": False, "error": "request must be a JSON object"}))
+                    continue
+                self.server.telemetry.submit(request, sub)
+        except OSError:
+            pass
+        sub.send(None)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, telemetry: "TelemetryServer"):
+        self.telemetry = telemetry
+        super().__init__(address, _Handler)
+
+
+def _encode(message: dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class TelemetryServer:
+    def __init__(
+        self,
+        controller: MotorController,
+        motor_ids: list[int],
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_LISTEN_PORT,
+        interval: float = 0.05,
+        metrics: MetricsRegistry | None = None,
+    ):
+        self._controller = controller
+        self._metrics = metrics
+        self._health = HealthMonitor()
+        self._motor_ids = list(motor_ids)
+        self._address = (host, port)
+        self._interval = interval
+        self._commands: queue.Queue[tuple[dict, _Subscriber | None]] = queue.Queue()
+        self._subscribers: set[_Subscriber] = set()
+        self._subs_lock = threading.Lock()
+        self._running = threading.Event()
+        self._server: _ThreadingServer | None = None
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address if self._server else self._address
+
+    @property
+    def client_count(self) -> int:
+        with self._subs_lock:
+            return len(self._subscribers)
+
+    def start(self) -> None:
+        self._server = _ThreadingServer(self._address, self)
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._poll_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        with self._subs_lock:
+            for sub in self._subscribers:
+                sub.send(None)
+        for t in self._threads:
+            t.join(timeout=2)
+
+    def submit(self, request: dict, reply_to: _Subscriber | None = None) -> None:
+        self._commands.put((request, reply_to))
+
+    def _add_subscriber(self, sub: _Subscriber) -> None:
+        with self._subs_lock:
+            self._subscribers.add(sub)
+        sub.send(_encode({"type": "hello", "motor_ids": self._motor_ids}))
+
+    def _remove_subscriber(self, sub: _Subscriber) -> None:
+        with self._subs_lock:
+            self._subscribers.discard(sub)
+
+    def _broadcast(self, line: bytes) -> None:
+        with self._subs_lock:
+            subs = list(self._subscribers)
+        for sub in subs:
+            sub.send(line)
+
+    def _execute(self, request: dict, reply_to: _Subscriber | None) -> None:
+        reply = {"type": "result"}
+        try:
+            cmd = request.get("cmd")
+            reply.update(id=request.get("id"), cmd=cmd)
+            params = COMMANDS.get(cmd)
+            if params is None:
+                raise ValueError(f"unknown command: {cmd}")
+            args = {k: request[k] for k in params if k in request}
+            result = getattr(self._controller, cmd)(**args)
+            reply.update(ok=True, result=result)
+        except Exception as e:
+            reply.update(ok=False, error=str(e))
+        if reply_to is not None:
+            reply_to.send(_encode(reply))
+
+    def _poll_loop(self) -> None:
+        next_tick = time.monotonic()
+        while self._running.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                # 한 번의 실패(메트릭, 상태 감시, 명령 등)로 모든 구독자의 폴링이 멈추지 않도록
+                print(f"Telemetry poll failed: {e!r}", file=sys.stderr)
+
+            next_tick += self._interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+
+    def _tick(self) -> None:
+        # 모든 클라이언트의 명령은 하나의 큐에서 폴링 사이에 순서대로 실행
+        while True:
+            try:
+                request, reply_to = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            self._execute(request, reply_to)
+
+        # 동기 읽기 한 번으로 모든 모터 상태를 읽는다
+        start = time.perf_counter()
+        try:
+            statuses = self._controller.read_status_many(self._motor_ids)
+            failure = "no status packet"
+        except Exception as e:
+            statuses = {}
+            failure = str(e)
+        latency = time.perf_counter() - start
+
+        motors = {}
+        for motor_id in self._motor_ids:
+            status = statuses.get(motor_id)
+            if status is None:
+                motors[str(motor_id)] = {"error": failure}
+                if self._metrics:
+                    self._metrics.observe_error(motor_id, latency)
+                continue
+            if self._metrics:
+                self._metrics.observe(motor_id, status, latency)
+            motors[str(motor_id)] = status_to_dict(status)
+            for alert in self._health.update(motor_id, status):
+                if self._metrics:
+                    self._metrics.observe_alert(motor_id, alert.kind)
+                self._broadcast(_encode({"type": "alert", **asdict(alert)}))
+        if self._metrics:
+            self._metrics.publish()
+        # 한 번 인코딩한 프레임을 모든 구독자가 공유
+        self._broadcast(_encode({"type": "status", "t": time.time(), "motors": motors}))
+
+
+class TelemetryClient:
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_LISTEN_PORT):
+        self._sock = socket.create_connection((host, port))
+        self._rfile = self._sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self._next_id = 0
+
+    def close(self) -> None:
+        self._rfile.close()
+        self._sock.close()
+
+    def send(self, cmd: str, **args) -> int:
+        with self._send_lock:
+            self._next_id += 1
+            self._sock.sendall(_encode({"cmd": cmd, "id": self._next_id, **args}))
+            return self._next_id
+
+    def messages(self):
+        for raw in self._rfile:
+            yield json.loads(raw)
+
+
+def run_server(
+    port: str,
+    motor_ids: list[int] | None,
+    listen: int,
+    baudrate: int = DEFAULT_BAUDRATE,
+    metrics_port: int | None = None,
+) -> int:
+    controller = MotorController()
+    controller.connect(port, baudrate)
+    if not motor_ids:
+        motor_ids = controller.scan_motors()
+    else:
+        # 스캔을 건너뛰므로 쓰기 응답 설정은 EEPROM에서 직접 읽는다
+        controller.read_identities(motor_ids)
+    metrics = MetricsRegistry() if metrics_port else None
+    metrics_server = None
+    if metrics:
+        metrics_server = MetricsServer(metrics, metrics_port)
+        metrics_server.start()
+        print(f"Metrics on http://127.0.0.1:{metrics_port}/metrics")
+    server = TelemetryServer(controller, motor_ids, port=listen, metrics=metrics)
+    server.start()
+    host, bound = server.address
+    print(f"Telemetry server on {host}:{bound} — {port} motors {motor_ids}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        if metrics_server:
+            metrics_server.stop()
+        controller.disconnect()
+    return 0
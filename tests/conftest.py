@@ -0,0 +1,22 @@
+import pytest
+
+import motor_controller
+from motor_controller import MotorController
+from sts_protocol import PacketEngine
+from tests.fakebus import FakePort, FakeSerial
+
+
+@pytest.fixture
+def make_bus(monkeypatch):
+    # 연결된 MotorController와 그 뒤의 가짜 버스
+    monkeypatch.setattr(motor_controller, "EEPROM_WRITE_DELAY", 0)
+
+    def make(ids, chunk=64):
+        ser = FakeSerial(ids, chunk)
+        controller = MotorController()
+        controller._servo = object()
+        controller._engine = PacketEngine(FakePort(ser))
+        controller._connected = True
+        return controller, ser
+
+    return make
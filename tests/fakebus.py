@@ -0,0 +1,76 @@
+from st3215.values import INST_PING, INST_READ, INST_SYNC_READ, INST_SYNC_WRITE, INST_WRITE, STS_ID
+
+# 모터를 구별하기 위한 표식 (ID가 바뀌어도 따라가는 값, 펌웨어 버전 자리에 기록)
+TAG = 0
+
+
+class FakeSerial:
+    # 모터마다 256바이트 메모리 테이블을 가진 가짜 버스. 응답은 chunk 바이트씩 나뉘어 도착한다.
+
+    def __init__(self, ids, chunk=64):
+        self.motors: dict[int, bytearray] = {}
+        for motor_id in ids:
+            m = bytearray(256)
+            m[TAG] = motor_id
+            m[STS_ID] = motor_id
+            m[8] = 1  # status return level
+            m[56:58] = (motor_id * 10).to_bytes(2, "little")  # present position
+            self.motors[motor_id] = m
+        self.chunk = chunk
+        self.rx = bytearray()
+        self.drop = None  # 패킷을 받아 True를 돌려주면 그 패킷은 전송 중 유실된 것으로 처리
+
+    def layout(self) -> dict[int, int]:
+        return {motor_id: m[TAG] for motor_id, m in self.motors.items()}
+
+    def reset_input_buffer(self):
+        self.rx.clear()
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self.rx), self.chunk)
+        buf[:n] = self.rx[:n]
+        del self.rx[:n]
+        return n
+
+    def reply(self, motor_id, params=b"", error=0):
+        body = bytes([motor_id, len(params) + 2, error]) + bytes(params)
+        self.rx += b"\xff\xff" + body + bytes([~sum(body) & 0xFF])
+
+    def write(self, data):
+        packet = bytes(data)
+        assert packet[:2] == b"\xff\xff"
+        assert packet[-1] == ~sum(packet[2:-1]) & 0xFF, "bad checksum"
+        if self.drop and self.drop(packet):
+            return len(packet)
+        motor_id, instruction, params = packet[2], packet[4], packet[5:-1]
+        m = self.motors.get(motor_id)
+        if instruction == INST_PING and m:
+            self.reply(motor_id)
+        elif instruction == INST_READ and m:
+            address, length = params
+            self.reply(motor_id, m[address:address + length])
+        elif instruction == INST_WRITE and m:
+            address = params[0]
+            m[address:address + len(params) - 1] = params[1:]
+            if m[STS_ID] != motor_id:
+                self.motors[m[STS_ID]] = self.motors.pop(motor_id)
+            if m[8]:
+                self.reply(m[STS_ID])
+        elif instruction == INST_SYNC_READ:
+            address, length = params[0], params[1]
+            for target in params[2:]:
+                if target in self.motors:
+                    self.reply(target, self.motors[target][address:address + length])
+        elif instruction == INST_SYNC_WRITE:
+            address, length = params[0], params[1]
+            for i in range(2, len(params), 1 + length):
+                target = self.motors.get(params[i])
+                if target:
+                    target[address:address + length] = params[i + 1:i + 1 + length]
+        return len(packet)
+
+
+class FakePort:
+    def __init__(self, ser):
+        self.ser = ser
+        self.baudrate = 1_000_000
@@ -0,0 +1,93 @@
+import pytest
+from st3215.values import INST_WRITE, STS_ID, STS_LOCK
+
+from motor_controller import _remap_steps
+
+
+def _replay(steps, ids):
+    # 단계를 순서대로 적용하며, 이미 쓰이는 ID로 옮기는 단계가 없는지 확인
+    occupied = set(ids)
+    for cur, new in steps:
+        assert cur in occupied
+        assert new not in occupied
+        occupied.remove(cur)
+        occupied.add(new)
+    return occupied
+
+
+def test_steps_move_to_free_ids_first():
+    assert _remap_steps({1: 2, 2: 5}, []) == [(2, 5), (1, 2)]
+
+
+def test_steps_break_cycle_through_spare():
+    steps = _remap_steps({1: 2, 2: 3, 3: 1}, [253])
+    assert steps == [(1, 253), (3, 1), (2, 3), (253, 2)]
+    assert _replay(steps, {1, 2, 3}) == {1, 2, 3}
+
+
+def test_steps_two_cycles_use_spares_in_order():
+    spares = [253, 252]
+    steps = _remap_steps({1: 2, 2: 1, 5: 6, 6: 5}, spares)
+    assert [new for _, new in steps if new in (253, 252)] == [253, 252]
+    assert spares == []
+    assert _replay(steps, {1, 2, 5, 6}) == {1, 2, 5, 6}
+
+
+def test_steps_cycle_without_spare_raises():
+    with pytest.raises(RuntimeError, match="No free ID"):
+        _remap_steps({1: 2, 2: 1}, [])
+
+
+def test_remap_cycle_and_move(make_bus):
+    controller, ser = make_bus([1, 2, 3, 4])
+    steps = controller.remap_ids({1: 2, 2: 3, 3: 1, 4: 9})
+    assert ser.layout() == {2: 1, 3: 2, 1: 3, 9: 4}
+    assert all(m[STS_LOCK] == 1 for m in ser.motors.values())
+    assert _replay(steps, {1, 2, 3, 4}) == {1, 2, 3, 9}
+
+
+def test_remap_spare_skips_ids_in_use(make_bus):
+    # 253은 계획에 없는 모터가 쓰고 있으므로 임시 ID는 그다음 빈 ID
+    controller, ser = make_bus([1, 2, 253])
+    steps = controller.remap_ids({1: 2, 2: 1})
+    assert (1, 252) in steps
+    assert ser.layout() == {1: 2, 2: 1, 253: 253}
+
+
+def test_remap_rejects_collision_without_writing(make_bus):
+    controller, ser = make_bus([1, 2, 3])
+    sent = []
+    ser.drop = lambda packet: sent.append(packet) and False
+    with pytest.raises(RuntimeError, match="already in use"):
+        controller.remap_ids({1: 3})
+    assert ser.layout() == {1: 1, 2: 2, 3: 3}
+    assert not [p for p in sent if p[4] == INST_WRITE]
+
+
+@pytest.mark.parametrize("plan, error", [
+    ({1: 5, 2: 5}, ValueError),
+    ({1: 254}, ValueError),
+    ({7: 5}, RuntimeError),
+])
+def test_remap_rejects_invalid_plan(make_bus, plan, error):
+    controller, ser = make_bus([1, 2])
+    with pytest.raises(error):
+        controller.remap_ids(plan)
+    assert ser.layout() == {1: 1, 2: 2}
+
+
+def test_remap_rolls_back_after_dropped_id_write(make_bus):
+    controller, ser = make_bus([1, 2, 3])
+    id_writes = []
+
+    def drop_third_id_write(packet):
+        if packet[4] == INST_WRITE and packet[5] == STS_ID:
+            id_writes.append(packet)
+            return len(id_writes) == 3
+        return False
+
+    ser.drop = drop_third_id_write
+    with pytest.raises(RuntimeError, match="original IDs restored"):
+        controller.remap_ids({1: 2, 2: 3, 3: 1})
+    assert ser.layout() == {1: 1, 2: 2, 3: 3}
+    assert all(m[STS_LOCK] == 1 for m in ser.motors.values())
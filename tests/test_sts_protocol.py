@@ -0,0 +1,97 @@
+import pytest
+from st3215.values import STS_PRESENT_POSITION_L
+
+from sts_protocol import CommError, PacketEngine
+from tests.fakebus import FakePort, FakeSerial
+
+
+def _packet(motor_id, params=b"", error=0):
+    body = bytes([motor_id, len(params) + 2, error]) + bytes(params)
+    return b"\xff\xff" + body + bytes([~sum(body) & 0xFF])
+
+
+class NoisySerial(FakeSerial):
+    # 응답 앞에 잡음 바이트가 끼어드는 버스
+    def __init__(self, ids, noise, chunk=64):
+        super().__init__(ids, chunk)
+        self.noise = noise
+
+    def write(self, data):
+        n = super().write(data)
+        self.rx[0:0] = self.noise
+        return n
+
+
+def _engine(data=b""):
+    engine = PacketEngine(FakePort(FakeSerial([])))
+    engine._rx[:len(data)] = data
+    return engine
+
+
+def test_parse_skips_noise_bad_checksum_and_unwanted_ids():
+    corrupt = bytearray(_packet(2, b"\x07"))
+    corrupt[-1] ^= 0xFF
+    data = b"\x00\xff" + _packet(9, b"\x01") + bytes(corrupt) + _packet(1, b"\x05\x06", error=0x20) + _packet(2, b"\x08")
+    engine = _engine(data)
+    wanted = {1, 2}
+    result = {}
+    assert engine._parse(0, len(data), wanted, result, 4) == len(data)
+    assert wanted == set()
+    assert {mid: (error, bytes(d)) for mid, (error, d) in result.items()} == {
+        1: (0x20, b"\x05\x06"),
+        2: (0, b"\x08"),
+    }
+
+
+def test_parse_resumes_partial_packet():
+    data = _packet(1, b"\x05\x06") + _packet(2, b"\x07\x08")
+    engine = _engine(data)
+    wanted = {1, 2}
+    result = {}
+    # 두 번째 패킷은 헤더만 도착한 상태: 그 위치에서 다시 시작해야 한다
+    pos = engine._parse(0, 10, wanted, result, 4)
+    assert pos == 8
+    assert list(result) == [1]
+    assert engine._parse(pos, len(data), wanted, result, 4) == len(data)
+    assert bytes(result[2][1]) == b"\x07\x08"
+
+
+def test_parse_keeps_split_header():
+    data = _packet(1)
+    engine = _engine(data)
+    result = {}
+    assert engine._parse(0, 1, {1}, result, 2) == 0
+    assert engine._parse(0, len(data), {1}, result, 2) == len(data)
+    assert 1 in result
+
+
+@pytest.mark.parametrize("chunk", [1, 5, 64])
+def test_sync_read_with_fragmented_replies(chunk):
+    ser = FakeSerial([1, 2, 3], chunk=chunk)
+    engine = PacketEngine(FakePort(ser))
+    replies = engine.sync_read([1, 2, 3, 4], STS_PRESENT_POSITION_L, 2)
+    assert sorted(replies) == [1, 2, 3]
+    assert {mid: bytes(d) for mid, (_, d) in replies.items()} == {1: b"\x0a\x00", 2: b"\x14\x00", 3: b"\x1e\x00"}
+
+
+def test_ping_missing_motor_raises():
+    engine = PacketEngine(FakePort(FakeSerial([1])))
+    assert engine.ping(1) == 0
+    with pytest.raises(CommError):
+        engine.ping(2)
+
+
+def test_parse_skips_header_with_impossible_length():
+    data = b"\xff\xff\x01\xc8" + _packet(1, b"\x05\x06")
+    engine = _engine(data)
+    result = {}
+    assert engine._parse(0, len(data), {1}, result, 4) == len(data)
+    assert bytes(result[1][1]) == b"\x05\x06"
+
+
+@pytest.mark.parametrize("noise", [b"\x00", b"\xff\xff\x01\xc8"])
+def test_receive_resyncs_after_noise(noise):
+    engine = PacketEngine(FakePort(NoisySerial([1, 2, 3], noise, chunk=5)))
+    assert sorted(engine.sync_read([1, 2, 3], STS_PRESENT_POSITION_L, 2)) == [1, 2, 3]
+    _, data = engine.read(1, STS_PRESENT_POSITION_L, 2)
+    assert bytes(data) == b"\x0a\x00"
@@ -0,0 +1,67 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from motor_controller import MotorIdentity
+
+CACHE_PATH = Path.home() / ".config" / "sts3215-motor-test" / "topology.json"
+
+
+@dataclass
+class BusTopology:
+    serial_number: str  # USB 시리얼 어댑터의 시리얼 번호
+    baudrate: int
+    motors: dict[int, MotorIdentity] = field(default_factory=dict)
+
+    @property
+    def ids(self) -> list[int]:
+        return sorted(self.motors)
+
+    def matches(self, identities: dict[int, MotorIdentity]) -> bool:
+        # 알려진 모터가 모두 같은 모델/설정으로 응답해야 일치
+        return bool(self.motors) and all(identities.get(mid) == m for mid, m in self.motors.items())
+
+
+class TopologyCache:
+    # 어댑터별로 마지막에 발견한 버스 구성을 JSON 파일에 보관한다
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self._path = path
+        self._entries: dict[str, BusTopology] = {}
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for serial_number, entry in raw.items():
+            try:
+                self._entries[serial_number] = BusTopology(
+                    serial_number=serial_number,
+                    baudrate=int(entry["baudrate"]),
+                    motors={int(mid): MotorIdentity(**m) for mid, m in entry["motors"].items()},
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def get(self, serial_number: str | None) -> BusTopology | None:
+        if not serial_number:
+            return None
+        return self._entries.get(serial_number)
+
+    def put(self, topology: BusTopology) -> None:
+        self._entries[topology.serial_number] = topology
+        self._save()
+
+    def _save(self) -> None:
+        data = {
+            t.serial_number: {
+                "baudrate": t.baudrate,
+                "motors": {str(mid): asdict(m) for mid, m in sorted(t.motors.items())},
+            }
+            for t in self._entries.values()
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰는 도중 종료되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, self._path)
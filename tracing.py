@@ -0,0 +1,139 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_cat", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._tracer.record(self._name, self._cat, self._start, time.perf_counter_ns() - self._start)
+        return False
+
+
+class Tracer:
+    # 완료된 구간을 (이름, 분류, 시작 ns, 길이 ns, 스레드) 튜플로 링 버퍼에 보관한다.
+    # 비활성 상태에서는 enabled 확인 한 번 외에 하는 일이 없다.
+
+    def __init__(self, capacity: int = 200_000):
+        self.enabled = False
+        self._events: deque[tuple[str, str, int, int, int]] = deque(maxlen=capacity)
+        self._threads: dict[int, str] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def span(self, name: str, cat: str = "app"):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat)
+
+    def record(self, name: str, cat: str, start_ns: int, dur_ns: int) -> None:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, cat, start_ns, dur_ns, tid))
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        events.extend(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": dur / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, cat, start, dur, tid in list(self._events)
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> int:
+        trace = self.to_chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return len(trace["traceEvents"])
+
+
+tracer = Tracer()
+
+
+def traced(cat: str):
+    def decorator(fn):
+        name = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(name, cat, start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class TracedLock:
+    # threading.Lock 대용: 추적 중에는 락 대기 시간을 별도 구간으로 기록한다
+    __slots__ = ("_lock", "_name")
+
+    def __init__(self, name: str):
+        self._lock = threading.Lock()
+        self._name = name
+
+    def __enter__(self):
+        if not tracer.enabled:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            start = time.perf_counter_ns()
+            self._lock.acquire()
+            tracer.record(self._name, "lock_wait", start, time.perf_counter_ns() - start)
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        return False
@@ -0,0 +1,136 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QGroupBox,
+    QHBoxLayout,
+    QLabel,
+    QMainWindow,
+    QPushButton,
+    QStatusBar,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from bus_workers import BusSupervisor
+from motor_controller import MotorStatus
+from ui.main_window import COLOR_DANGER, COLOR_SUCCESS, COLOR_WARNING, _add_shadow, window_stylesheet
+
+COLUMNS = ["포트", "ID", "위치", "속도", "부하", "전압", "온도", "전류", "상태"]
+REFRESH_INTERVAL = 50  # ms
+
+
+class BusMonitorWindow(QMainWindow):
+    # 여러 버스 동시 모니터링: 버스마다 워커 프로세스가 폴링하고, 이 창은 공유 메모리 링만 읽는다
+
+    def __init__(self, supervisor: BusSupervisor):
+        super().__init__()
+        self.setWindowTitle("STS3215 Multi-Bus Monitor — RoboSEasy")
+        self.setMinimumSize(900, 600)
+        self.setStyleSheet(window_stylesheet())
+        self._supervisor = supervisor
+        self._rows: dict[tuple[str, int], int] = {}
+        self._samples: dict[str, int] = {port: 0 for port in supervisor.workers}
+        self._restarts: dict[str, int] = {port: 0 for port in supervisor.workers}
+
+        central = QWidget()
+        central.setObjectName("centralWidget")
+        self.setCentralWidget(central)
+        body = QVBoxLayout(central)
+        body.setContentsMargins(16, 8, 16, 8)
+
+        group = QGroupBox("버스")
+        _add_shadow(group)
+        h = QHBoxLayout(group)
+        self._worker_labels: dict[str, QLabel] = {}
+        for port in supervisor.workers:
+            label = QLabel(f"{port}: 시작 중")
+            self._worker_labels[port] = label
+            h.addWidget(label)
+        h.addStretch()
+        self._stop_all_btn = QPushButton("⏹ 모두 정지")
+        self._stop_all_btn.setObjectName("dangerBtn")
+        self._stop_all_btn.clicked.connect(self._stop_all)
+        h.addWidget(self._stop_all_btn)
+        body.addWidget(group)
+
+        group = QGroupBox("상태")
+        _add_shadow(group)
+        v = QVBoxLayout(group)
+        self._table = QTableWidget(0, len(COLUMNS))
+        self._table.setHorizontalHeaderLabels(COLUMNS)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setSortingEnabled(False)
+        v.addWidget(self._table)
+        body.addWidget(group)
+
+        status_bar = QStatusBar()
+        self.setStatusBar(status_bar)
+
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._refresh)
+        self._timer.start(REFRESH_INTERVAL)
+        self._rate_timer = QTimer()
+        self._rate_timer.timeout.connect(self._update_rates)
+        self._rate_timer.start(1000)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        self._rate_timer.stop()
+        self._supervisor.stop()
+        super().closeEvent(event)
+
+    def _refresh(self):
+        # 링에 쌓인 레코드 중 모터별 최신 값만 화면에 반영
+        latest: dict[tuple[str, int], MotorStatus] = {}
+        for record in self._supervisor.poll():
+            latest[(record.port, record.motor_id)] = record.status
+            self._samples[record.port] += 1
+        for key, status in latest.items():
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = self._table.rowCount()
+                self._table.insertRow(row)
+                self._set(row, 0, key[0])
+                self._set(row, 1, str(key[1]))
+            self._set(row, 2, str(status.position))
+            self._set(row, 3, str(status.speed))
+            self._set(row, 4, str(status.load))
+            self._set(row, 5, f"{status.voltage:.1f} V")
+            self._set(row, 6, f"{status.temperature} °C")
+            self._set(row, 7, f"{status.current:.0f} mA")
+            self._set(row, 8, "이동 중" if status.is_moving else "정지")
+
+    def _set(self, row: int, col: int, text: str):
+        item = self._table.item(row, col)
+        if item is None:
+            self._table.setItem(row, col, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+    def _update_rates(self):
+        for port, worker in self._supervisor.workers.items():
+            label = self._worker_labels[port]
+            rate = self._samples[port]
+            self._samples[port] = 0
+            if worker.running:
+                label.setText(f"{port}: {rate} 샘플/s")
+                color = COLOR_SUCCESS
+            elif worker.alive:
+                label.setText(f"{port}: 연결 중")
+                color = COLOR_WARNING
+            else:
+                label.setText(f"{port}: 재시작 대기")
+                color = COLOR_DANGER
+            if worker.restarts != self._restarts[port]:
+                self._restarts[port] = worker.restarts
+                self.statusBar().showMessage(f"{port} 워커 재시작 ({worker.restarts}회)", 5000)
+            if worker.restarts and worker.running:
+                color = COLOR_WARNING
+                label.setText(f"{label.text()} (재시작 {worker.restarts}회)")
+            label.setStyleSheet(f"color: {color}; font-weight: bold;")
+
+    def _stop_all(self):
+        for port, motor_id in self._rows:
+            self._supervisor.send(port, "stop", motor_id)
+        self.statusBar().showMessage("모든 모터에 정지 명령을 보냈습니다", 3000)
@@ -1,8 +1,15 @@
-import serial.tools.list_ports
-from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+import os
+import platform
+import time
+from typing import TYPE_CHECKING
+
+import serial
+from PyQt6.QtCore import QEvent, Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QColor, QIntValidator
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
+    QFileDialog,
     QFrame,
     QGraphicsDropShadowEffect,
     QGroupBox,
@@ -21,7 +28,15 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from motor_controller import MotorController, MotorStatus
+from health_monitor import HealthMonitor
+from motor_controller import DEFAULT_BAUDRATE, MotorController, MotorStatus
+from topology_cache import BusTopology, TopologyCache
+from tracing import traced, tracer
+from ui.port_watcher import PortInfo, PortWatcher
+
+if TYPE_CHECKING:
+    # http.server를 끌어오므로 시작 시에는 불러오지 않는다 (--metrics-port일 때만 main.py가 불러옴)
+    from metrics_exporter import MetricsRegistry
 
 # ── Design System Colors ──
 COLOR_HEADER = "#3B1D6B"
@@ -36,6 +51,16 @@ COLOR_BAR_START = "#A78BDA"
 COLOR_BAR_END = "#C4B2EC"
 COLOR_SUCCESS = "#5BAD7A"
 COLOR_DANGER = "#E04848"
+COLOR_WARNING = "#E0A030"
+
+# 연결 끊김 후 재연결 백오프 (ms)
+RECONNECT_DELAY_MIN = 500
+RECONNECT_DELAY_MAX = 8000
+
+# 렌더링 모드: quality는 카드마다 블러 그림자, performance는 같은 모양을 테두리로만 그린다
+RENDER_QUALITY = "quality"
+RENDER_PERFORMANCE = "performance"
+PAINT_EWMA_ALPHA = 0.2
 
 # ── Global Stylesheet ──
 STYLESHEET = """
@@ -283,8 +308,43 @@ QMessageBox QLabel {
 }
 """
 
+# 그림자 대신 아래쪽 테두리를 조금 진하게 (오프스크린 효과 없이 카드 느낌 유지)
+PERFORMANCE_STYLESHEET = """
+QGroupBox {
+    border: 1px solid #E2DCEC;
+    border-bottom: 3px solid #D6CEE4;
+}
+"""
+
+_render_mode = RENDER_QUALITY
+
+
+def detect_render_mode() -> str:
+    # STS_RENDER_MODE 환경 변수가 우선, 없으면 저전력 PC(코어 4개 이하, ARM)에서 performance
+    mode = os.environ.get("STS_RENDER_MODE")
+    if mode in (RENDER_QUALITY, RENDER_PERFORMANCE):
+        return mode
+    if (os.cpu_count() or 1) <= 4 or platform.machine().lower().startswith(("arm", "aarch")):
+        return RENDER_PERFORMANCE
+    return RENDER_QUALITY
+
+
+def set_render_mode(mode: str) -> None:
+    # 창을 만들기 전에 호출해야 한다
+    global _render_mode
+    _render_mode = mode
+
+
+def window_stylesheet() -> str:
+    if _render_mode == RENDER_PERFORMANCE:
+        return STYLESHEET + PERFORMANCE_STYLESHEET
+    return STYLESHEET
+
 
 def _add_shadow(widget: QWidget) -> None:
+    # QGraphicsEffect는 라벨 하나가 바뀌어도 카드 전체를 오프스크린으로 다시 그린다
+    if _render_mode == RENDER_PERFORMANCE:
+        return
     shadow = QGraphicsDropShadowEffect(widget)
     shadow.setBlurRadius(20)
     shadow.setOffset(0, 4)
@@ -305,25 +365,60 @@ class ScanWorker(QThread):
         found = []
         total = len(self._id_range)
         for i, motor_id in enumerate(self._id_range):
-            try:
-                if self._controller.ping(motor_id):
-                    found.append(motor_id)
-            except Exception:
-                pass
-            self.progress.emit(int((i + 1) / total * 100))
+            with tracer.span("ScanWorker.iteration", "scan"):
+                try:
+                    if self._controller.ping(motor_id):
+                        found.append(motor_id)
+                except Exception:
+                    pass
+                self.progress.emit(int((i + 1) / total * 100))
         self.found.emit(found)
 
 
+class TaskWorker(QThread):
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self._fn = fn
+        self._args = args
+
+    def run(self):
+        try:
+            result = self._fn(*self._args)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.done.emit(result)
+
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    first_painted = pyqtSignal()
+    ready = pyqtSignal()  # 지연 패널과 포트 감시까지 준비됨
+
+    def __init__(self, metrics: "MetricsRegistry | None" = None):
         super().__init__()
         self.setWindowTitle("STS3215 Motor Test — RoboSEasy")
         self.setMinimumSize(900, 900)
-        self.setStyleSheet(STYLESHEET)
+        self.setStyleSheet(window_stylesheet())
 
         self._controller = MotorController()
+        self._metrics = metrics
+        self._health = HealthMonitor()
+        self._topology = TopologyCache()
         self._current_motor_id: int | None = None
         self._monitoring = False
+        self._ports: list[PortInfo] = []
+        self._reconnect_port: str | None = None
+        self._reconnect_baudrate = 0
+        self._reconnect_motor_id: int | None = None
+        self._reconnect_monitoring = False
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._paint_pending = False
+        self._paint_ms: float | None = None
+        self._first_painted = False
+        self._deferred_built = False
 
         central = QWidget()
         central.setObjectName("centralWidget")
@@ -342,7 +437,9 @@ class MainWindow(QMainWindow):
 
         body.addWidget(self._build_connection_panel())
         body.addWidget(self._build_motor_select_panel())
-        body.addWidget(self._build_id_setup_panel())
+        # 버스 설정/도구/ID 설정 패널은 첫 화면을 그린 뒤 이 자리에 만든다 (_finish_startup)
+        self._body = body
+        self._deferred_index = body.count()
         body.addWidget(self._build_control_panel())
         body.addWidget(self._build_status_panel())
         body.addWidget(self._build_log_panel())
@@ -353,13 +450,61 @@ class MainWindow(QMainWindow):
         # Status bar
         status_bar = QStatusBar()
         status_bar.showMessage("STS3215 Motor Test Tool — RoboSEasy")
+        self._paint_label = QLabel(f"렌더링: {_render_mode}")
+        status_bar.addPermanentWidget(self._paint_label)
         self.setStatusBar(status_bar)
 
         self._poll_timer = QTimer()
         self._poll_timer.timeout.connect(self._poll_status)
 
+        self._reconnect_timer = QTimer()
+        self._reconnect_timer.setSingleShot(True)
+        self._reconnect_timer.timeout.connect(self._attempt_reconnect)
+
         self._set_controls_enabled(False)
 
+        # 포트 열거는 첫 화면을 그린 뒤 시작
+        self._port_watcher = PortWatcher()
+        self._port_watcher.ports_changed.connect(self._on_ports_changed)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_painted:
+            self._first_painted = True
+            self.first_painted.emit()
+            QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        for i, build in enumerate([self._build_bus_panel, self._build_tools_panel, self._build_id_setup_panel]):
+            self._body.insertWidget(self._deferred_index + i, build())
+        self._deferred_built = True
+        self._update_id_setup_label()
+        self._set_controls_enabled(self._controller.connected)
+        self._port_watcher.start()
+        self.ready.emit()
+
+    def event(self, event):
+        # 상태 갱신 직후의 UpdateRequest에서 창 전체의 다시 그리기(그림자 효과 포함)가 일어난다
+        if event.type() != QEvent.Type.UpdateRequest or not self._paint_pending:
+            return super().event(event)
+        self._paint_pending = False
+        start = time.perf_counter()
+        result = super().event(event)
+        ms = (time.perf_counter() - start) * 1000
+        if self._paint_ms is None:
+            self._paint_ms = ms
+        else:
+            self._paint_ms += PAINT_EWMA_ALPHA * (ms - self._paint_ms)
+        self._paint_label.setText(f"렌더링: {_render_mode} · {self._paint_ms:.2f} ms/갱신")
+        return result
+
+    def closeEvent(self, event):
+        self._reconnect_timer.stop()
+        self._poll_timer.stop()
+        self._port_watcher.stop()
+        self._controller.disconnect()
+        super().closeEvent(event)
+
     # ── Header ──
 
     def _build_header(self) -> QFrame:
@@ -398,6 +543,9 @@ class MainWindow(QMainWindow):
         refresh_btn.clicked.connect(self._refresh_ports)
         h.addWidget(refresh_btn)
 
+        self._auto_baud_check = QCheckBox("보드레이트 자동 감지")
+        h.addWidget(self._auto_baud_check)
+
         self._connect_btn = QPushButton("🔌 연결")
         self._connect_btn.setObjectName("connectBtn")
         self._connect_btn.clicked.connect(self._toggle_connection)
@@ -408,7 +556,6 @@ class MainWindow(QMainWindow):
         h.addWidget(self._status_led)
 
         h.addStretch()
-        self._refresh_ports()
         return group
 
     # ── Motor Select Panel ──
@@ -435,6 +582,91 @@ class MainWindow(QMainWindow):
         h.addStretch()
         return group
 
+    # ── Bus Panel ──
+
+    def _build_bus_panel(self) -> QGroupBox:
+        group = QGroupBox("버스 설정")
+        _add_shadow(group)
+        v = QVBoxLayout(group)
+
+        row1 = QHBoxLayout()
+        self._baud_upgrade_btn = QPushButton("⚡ 버스 속도 최적화")
+        self._baud_upgrade_btn.clicked.connect(self._upgrade_baudrate)
+        row1.addWidget(self._baud_upgrade_btn)
+
+        self._benchmark_btn = QPushButton("⏱ 통신 벤치마크")
+        self._benchmark_btn.clicked.connect(self._benchmark_protocol)
+        row1.addWidget(self._benchmark_btn)
+        row1.addStretch()
+        v.addLayout(row1)
+
+        h = QHBoxLayout()
+        h.addWidget(QLabel("응답 지연 (×2µs):"))
+        self._return_delay_input = QSpinBox()
+        self._return_delay_input.setRange(0, 254)
+        self._return_delay_input.setValue(0)
+        h.addWidget(self._return_delay_input)
+
+        self._ack_check = QCheckBox("쓰기 응답")
+        self._ack_check.setChecked(True)
+        h.addWidget(self._ack_check)
+
+        self._tuning_read_btn = QPushButton("📖 읽기")
+        self._tuning_read_btn.clicked.connect(self._read_bus_tuning)
+        h.addWidget(self._tuning_read_btn)
+
+        self._tuning_apply_btn = QPushButton("⚙ 적용")
+        self._tuning_apply_btn.clicked.connect(self._apply_bus_tuning)
+        h.addWidget(self._tuning_apply_btn)
+
+        h.addStretch()
+        v.addLayout(h)
+        return group
+
+    # ── Tools Panel ──
+
+    def _build_tools_panel(self) -> QGroupBox:
+        # 첫 화면 이후에 만들어지는 패널이라 여기서 불러와도 시작 시간에 영향이 없다
+        from characterization import SweepPlan
+
+        group = QGroupBox("도구")
+        _add_shadow(group)
+        v = QVBoxLayout(group)
+
+        h = QHBoxLayout()
+        self._calibrate_btn = QPushButton("🎯 자동 캘리브레이션")
+        self._calibrate_btn.clicked.connect(self._auto_calibrate)
+        h.addWidget(self._calibrate_btn)
+        h.addStretch()
+        v.addLayout(h)
+
+        # 특성 측정: 조합 목록은 쉼표로 구분
+        h = QHBoxLayout()
+        defaults = SweepPlan()
+        self._sweep_inputs: dict[str, QLineEdit] = {}
+        for key, label, values in [
+            ("speeds", "속도:", defaults.speeds),
+            ("accelerations", "가속도:", defaults.accelerations),
+            ("targets", "위치:", defaults.targets),
+        ]:
+            h.addWidget(QLabel(label))
+            edit = QLineEdit(", ".join(map(str, values)))
+            edit.setMinimumWidth(120)
+            self._sweep_inputs[key] = edit
+            h.addWidget(edit)
+
+        self._sweep_selected_check = QCheckBox("선택한 모터만")
+        self._sweep_selected_check.setChecked(True)
+        h.addWidget(self._sweep_selected_check)
+
+        self._sweep_btn = QPushButton("📈 특성 측정")
+        self._sweep_btn.clicked.connect(self._run_characterization)
+        h.addWidget(self._sweep_btn)
+
+        h.addStretch()
+        v.addLayout(h)
+        return group
+
     # ── ID Setup Panel ──
 
     def _build_id_setup_panel(self) -> QGroupBox:
@@ -461,6 +693,17 @@ class MainWindow(QMainWindow):
         self._id_change_btn.clicked.connect(self._change_motor_id)
         h.addWidget(self._id_change_btn)
 
+        h.addSpacing(16)
+        h.addWidget(QLabel("일괄:"))
+        self._remap_input = QLineEdit()
+        self._remap_input.setPlaceholderText("예: 1:2, 2:1, 3:7")
+        self._remap_input.setMinimumWidth(160)
+        h.addWidget(self._remap_input)
+
+        self._remap_btn = QPushButton("🔀 일괄 변경")
+        self._remap_btn.clicked.connect(self._remap_motor_ids)
+        h.addWidget(self._remap_btn)
+
         h.addStretch()
         return group
 
@@ -618,28 +861,38 @@ class MainWindow(QMainWindow):
             self._read_once_btn, self._pos_slider, self._pos_input,
             self._speed_slider, self._speed_input, self._accel_slider,
             self._accel_input, self._motor_combo,
-            self._id_new_input, self._id_change_btn,
+        ]:
+            w.setEnabled(enabled)
+        if not self._deferred_built:
+            return
+        for w in [
+            self._id_new_input, self._id_change_btn, self._remap_input, self._remap_btn,
+            self._baud_upgrade_btn, self._return_delay_input, self._ack_check,
+            self._tuning_read_btn, self._tuning_apply_btn, self._benchmark_btn,
+            self._calibrate_btn, self._sweep_btn, self._sweep_selected_check,
+            *self._sweep_inputs.values(),
         ]:
             w.setEnabled(enabled)
 
+    @traced("ui")
     def _update_status_display(self, status: MotorStatus):
-        def safe_val(v, fmt="d"):
-            if isinstance(v, tuple):
-                v = v[0] if v else 0
-            if fmt == "d":
-                return str(int(v)) if v is not None else "--"
-            elif fmt == ".1f":
-                return f"{float(v):.1f}" if v is not None else "--"
-            return str(v) if v is not None else "--"
-
-        self._status_labels["위치"].setText(safe_val(status.position))
-        self._status_labels["속도"].setText(safe_val(status.speed))
-        self._status_labels["온도"].setText(safe_val(status.temperature))
-        self._status_labels["전압"].setText(safe_val(status.voltage, ".1f"))
-        self._status_labels["전류"].setText(safe_val(status.current))
-        self._status_labels["부하"].setText(safe_val(status.load))
+        self._status_labels["위치"].setText(str(status.position))
+        self._status_labels["속도"].setText(str(status.speed))
+        self._status_labels["온도"].setText(str(status.temperature))
+        self._status_labels["전압"].setText(f"{status.voltage:.1f}")
+        self._status_labels["전류"].setText(f"{status.current:.0f}")
+        self._status_labels["부하"].setText(str(status.load))
+        self._paint_pending = True
+
+    def _set_connection_ui(self, connected: bool):
+        self._connect_btn.setText("🔌 연결 해제" if connected else "🔌 연결")
+        color = COLOR_SUCCESS if connected else COLOR_DANGER
+        self._status_led.setStyleSheet(f"color: {color}; font-size: 18px;")
+        self._set_controls_enabled(connected)
 
     def _update_id_setup_label(self):
+        if not self._deferred_built:
+            return
         if self._current_motor_id is not None:
             self._id_current_label.setText(f"ID: {self._current_motor_id}")
         else:
@@ -648,24 +901,99 @@ class MainWindow(QMainWindow):
     # ── Slots ──
 
     def _refresh_ports(self):
+        self._port_watcher.rescan()
+
+    def _on_ports_changed(self, ports: list[PortInfo]):
+        self._ports = ports
+        selected = self._port_combo.currentData()
+        self._port_combo.blockSignals(True)
         self._port_combo.clear()
-        ports = serial.tools.list_ports.comports()
-        # 내장 시리얼 포트(ttyS*) 제외, USB 시리얼만 표시
-        usb_ports = [p for p in ports if "/dev/ttyS" not in p.device]
-        for p in usb_ports:
+        for p in ports:
             self._port_combo.addItem(f"{p.device} - {p.description}", p.device)
-        if usb_ports:
-            self._port_combo.setCurrentIndex(0)
-            self._log(f"USB 시리얼 포트 발견: {len(usb_ports)}개")
+        idx = self._port_combo.findData(selected)
+        self._port_combo.setCurrentIndex(idx if idx >= 0 else 0)
+        self._port_combo.blockSignals(False)
+        if ports:
+            self._log(f"USB 시리얼 포트 발견: {len(ports)}개")
         else:
             self._log("USB 시리얼 포트를 찾을 수 없습니다.")
 
+        devices = {p.device for p in ports}
+        if self._controller.connected and self._controller.port not in devices:
+            self._on_connection_lost()
+        elif self._reconnect_port in devices:
+            # 어댑터가 다시 꽂히면 백오프 대기 없이 바로 재연결 시도
+            self._reconnect_delay = RECONNECT_DELAY_MIN
+            self._reconnect_timer.start(0)
+
+    def _on_connection_lost(self):
+        if self._reconnect_port is not None:
+            return
+        self._reconnect_port = self._controller.port
+        self._reconnect_baudrate = self._controller.baudrate
+        self._reconnect_motor_id = self._current_motor_id
+        self._reconnect_monitoring = self._monitoring
+        self._poll_timer.stop()
+        self._controller.disconnect()
+        self._set_connection_ui(False)
+        self._status_led.setStyleSheet(f"color: {COLOR_WARNING}; font-size: 18px;")
+        self._log(f"연결 끊김 감지: {self._reconnect_port} — 자동 재연결 대기 중")
+        self._reconnect_delay = RECONNECT_DELAY_MIN
+        self._reconnect_timer.start(self._reconnect_delay)
+
+    def _cancel_reconnect(self):
+        self._reconnect_timer.stop()
+        self._reconnect_port = None
+        self._reconnect_motor_id = None
+        self._reconnect_monitoring = False
+
+    def _attempt_reconnect(self):
+        port = self._reconnect_port
+        if port is None:
+            return
+        if port in {p.device for p in self._ports}:
+            try:
+                self._controller.connect(port, self._reconnect_baudrate)
+            except Exception as e:
+                self._log(f"재연결 실패: {e}")
+            else:
+                self._on_reconnected()
+                return
+        self._reconnect_delay = min(self._reconnect_delay * 2, RECONNECT_DELAY_MAX)
+        self._reconnect_timer.start(self._reconnect_delay)
+
+    def _on_reconnected(self):
+        port = self._reconnect_port
+        motor_id = self._reconnect_motor_id
+        monitoring = self._reconnect_monitoring
+        self._cancel_reconnect()
+        self._set_connection_ui(True)
+        idx = self._port_combo.findData(port)
+        if idx >= 0:
+            self._port_combo.setCurrentIndex(idx)
+        self._log(f"재연결 성공: {port}")
+
+        if motor_id is None:
+            return
+        idx = self._motor_combo.findData(motor_id)
+        if idx >= 0:
+            self._motor_combo.setCurrentIndex(idx)
+        if not self._controller.ping(motor_id):
+            self._log(f"ID {motor_id} 응답 없음 — 모터 전원을 확인하세요.")
+        if monitoring:
+            self._start_monitoring()
+        else:
+            self._stop_monitoring()
+
     def _toggle_connection(self):
-        if self._controller.connected:
+        if self._reconnect_port is not None:
+            self._cancel_reconnect()
+            self._set_connection_ui(False)
+            self._stop_monitoring()
+            self._log("자동 재연결 취소됨")
+        elif self._controller.connected:
             self._controller.disconnect()
-            self._connect_btn.setText("🔌 연결")
-            self._status_led.setStyleSheet(f"color: {COLOR_DANGER}; font-size: 18px;")
-            self._set_controls_enabled(False)
+            self._set_connection_ui(False)
             self._stop_monitoring()
             self._log("연결 해제됨")
         else:
@@ -673,12 +1001,15 @@ class MainWindow(QMainWindow):
             if not port:
                 self._log("포트를 선택하세요.")
                 return
+            cached = self._topology.get(self._adapter_serial(port))
             try:
-                self._controller.connect(port)
-                self._connect_btn.setText("🔌 연결 해제")
-                self._status_led.setStyleSheet(f"color: {COLOR_SUCCESS}; font-size: 18px;")
-                self._set_controls_enabled(True)
+                self._controller.connect(port, cached.baudrate if cached else DEFAULT_BAUDRATE)
+                self._set_connection_ui(True)
                 self._log(f"연결 성공: {port}")
+                if cached:
+                    self._restore_topology(cached)
+                elif self._auto_baud_check.isChecked():
+                    self._detect_baudrates()
 
                 # 내장 시리얼 포트(ttyS*)는 장치 없이도 열리므로 경고
                 if "/dev/ttyS" in port:
@@ -709,18 +1040,140 @@ class MainWindow(QMainWindow):
 
         def on_found(ids: list[int]):
             progress.close()
-            self._motor_combo.clear()
-            for mid in ids:
-                self._motor_combo.addItem(f"ID: {mid}", mid)
+            self._fill_motor_combo(ids)
             self._log(f"스캔 완료: {len(ids)}개 모터 발견 {ids}")
             self._scan_btn.setEnabled(True)
-            # 첫 번째 모터 자동 선택
-            if ids:
-                self._motor_combo.setCurrentIndex(0)
+            self._remember_topology()
 
         self._scan_worker.found.connect(on_found)
         self._scan_worker.start()
 
+    def _fill_motor_combo(self, ids: list[int]):
+        self._motor_combo.clear()
+        for mid in ids:
+            self._motor_combo.addItem(f"ID: {mid}", mid)
+        # 첫 번째 모터 자동 선택
+        if ids:
+            self._motor_combo.setCurrentIndex(0)
+
+    def _adapter_serial(self, port: str) -> str | None:
+        for p in self._ports:
+            if p.device == port:
+                return p.serial_number
+        return None
+
+    def _restore_topology(self, cached: BusTopology):
+        # 저장된 모터만 동기 읽기 한 번으로 확인하고, 하나라도 다르면 전체 스캔
+        try:
+            identities = self._controller.read_identities(cached.ids)
+        except Exception as e:
+            self._log(f"저장된 구성 확인 실패: {e}")
+            identities = {}
+        if cached.matches(identities):
+            self._fill_motor_combo(cached.ids)
+            self._log(f"저장된 구성 확인 완료: {cached.baudrate} bps, 모터 {cached.ids}")
+            return
+        # 저장된 보드레이트가 더 이상 맞지 않을 수 있으므로 그 속도로는 스캔하지 않는다
+        if self._auto_baud_check.isChecked():
+            self._log("저장된 구성과 버스가 다릅니다. 보드레이트 자동 감지를 실행합니다.")
+            self._detect_baudrates()
+            return
+        self._log(f"저장된 구성과 버스가 다릅니다. {DEFAULT_BAUDRATE} bps로 다시 연결해 전체 스캔을 실행합니다.")
+        if self._controller.baudrate != DEFAULT_BAUDRATE:
+            try:
+                self._controller.connect(self._controller.port, DEFAULT_BAUDRATE)
+            except Exception as e:
+                self._log(f"재연결 실패: {e}")
+                self._set_connection_ui(False)
+                return
+        self._scan_motors()
+
+    def _remember_topology(self):
+        # 스캔이나 EEPROM 변경 후 현재 구성을 어댑터 시리얼 번호별로 저장
+        serial_number = self._adapter_serial(self._controller.port)
+        ids = self._scanned_motor_ids()
+        if not serial_number or not ids or not self._controller.connected:
+            return
+        try:
+            identities = self._controller.read_identities(ids)
+        except Exception as e:
+            self._log(f"버스 구성 저장 실패: {e}")
+            return
+        self._topology.put(BusTopology(serial_number, self._controller.baudrate, identities))
+
+    def _scanned_motor_ids(self) -> list[int]:
+        return [self._motor_combo.itemData(i) for i in range(self._motor_combo.count())]
+
+    def _run_task(self, fn, *args, on_done, label: str):
+        # 버스를 오래 점유하는 작업: 폴링이 UI 스레드에서 락을 기다리지 않도록 모니터링을 멈춘다
+        if self._monitoring:
+            self._stop_monitoring()
+        self._set_controls_enabled(False)
+        self._log(label)
+
+        def finished(result):
+            self._set_controls_enabled(self._controller.connected)
+            on_done(result)
+
+        def failed(msg: str):
+            self._set_controls_enabled(self._controller.connected)
+            self._log(f"작업 실패: {msg}")
+
+        self._task_worker = TaskWorker(fn, *args)
+        self._task_worker.done.connect(finished)
+        self._task_worker.failed.connect(failed)
+        self._task_worker.start()
+
+    def _detect_baudrates(self):
+        def on_done(found: dict[int, list[int]]):
+            if not found:
+                self._log("응답하는 모터가 없습니다. 기본 보드레이트를 유지합니다.")
+                return
+            for baudrate, ids in found.items():
+                self._log(f"  {baudrate} bps: {ids}")
+            if len(found) > 1:
+                self._log("⚠ 모터들이 서로 다른 보드레이트로 설정되어 있습니다.")
+            baudrate = self._controller.baudrate
+            ids = found.get(baudrate, [])
+            self._fill_motor_combo(ids)
+            self._log(f"보드레이트 감지 완료: {baudrate} bps, {len(ids)}개 모터 {ids}")
+            self._remember_topology()
+
+        self._run_task(
+            self._controller.detect_baudrates,
+            on_done=on_done,
+            label="보드레이트 자동 감지 중...",
+        )
+
+    def _upgrade_baudrate(self):
+        ids = self._scanned_motor_ids()
+        if not ids:
+            self._log("먼저 모터 스캔을 실행하세요.")
+            return
+        reply = QMessageBox.question(
+            self,
+            "버스 속도 최적화",
+            f"모터 {ids}의 통신 속도를 안정적으로 동작하는 최고 속도로 변경합니다.\n"
+            "모터 EEPROM 설정이 바뀝니다. 계속하시겠습니까?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        def on_done(result):
+            self._log(
+                f"버스 속도: {result.old_baudrate} → {result.new_baudrate} bps, "
+                f"처리량 {result.throughput_before:.0f} → {result.throughput_after:.0f} 회/s"
+            )
+            self._remember_topology()
+
+        self._run_task(
+            self._controller.upgrade_baudrate, ids,
+            on_done=on_done,
+            label="버스 속도 최적화 중...",
+        )
+
     def _on_motor_selected(self, text: str):
         idx = self._motor_combo.currentIndex()
         if idx >= 0:
@@ -757,15 +1210,220 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
+        self._apply_id_remap({current_id: new_id})
+
+    def _remap_motor_ids(self):
+        # "이전:새" 쌍을 쉼표로 구분 (교환/순환 가능)
         try:
-            self._controller.change_id(current_id, new_id)
-            self._log(f"ID 변경 성공: {current_id} → {new_id}")
-            self._current_motor_id = new_id
-            self._update_id_setup_label()
-            # 모터 콤보 갱신 권장
-            self._log("모터 재스캔을 권장합니다.")
+            plan = {}
+            for pair in self._remap_input.text().replace("→", ":").split(","):
+                if pair.strip():
+                    old, new = pair.split(":")
+                    plan[int(old)] = int(new)
+        except ValueError:
+            self._log("형식이 올바르지 않습니다. 예: 1:2, 2:1, 3:7")
+            return
+        if not plan:
+            return
+        text = ", ".join(f"{old} → {new}" for old, new in plan.items())
+        reply = QMessageBox.question(
+            self,
+            "ID 일괄 변경 확인",
+            f"다음과 같이 모터 ID를 변경하시겠습니까?\n{text}\n\n실패하면 원래 ID로 되돌립니다.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        self._apply_id_remap(plan)
+
+    def _apply_id_remap(self, plan: dict[int, int]):
+        try:
+            steps = self._controller.remap_ids(plan)
         except Exception as e:
             self._log(f"ID 변경 실패: {e}")
+            return
+        for old, new in plan.items():
+            self._log(f"ID 변경 성공: {old} → {new}")
+        if len(steps) > len(plan):
+            self._log(f"  임시 ID를 거쳐 {len(steps)}단계로 적용: {steps}")
+        # 확인된 새 배치로 모터 목록과 선택을 갱신
+        current = self._current_motor_id
+        ids = {plan.get(mid, mid) for mid in self._scanned_motor_ids()} | set(plan.values())
+        self._fill_motor_combo(sorted(ids))
+        if current is not None:
+            idx = self._motor_combo.findData(plan.get(current, current))
+            if idx >= 0:
+                self._motor_combo.setCurrentIndex(idx)
+        self._remember_topology()
+
+    def _read_bus_tuning(self):
+        ids = self._scanned_motor_ids()
+        if not ids:
+            self._log("먼저 모터 스캔을 실행하세요.")
+            return
+
+        def on_done(tunings):
+            for mid, t in tunings.items():
+                self._log(
+                    f"ID {mid}: 응답 지연 {t.return_delay * 2}µs, "
+                    f"쓰기 응답 {'ON' if t.status_return_level else 'OFF'}"
+                )
+            first = tunings[ids[0]]
+            self._return_delay_input.setValue(first.return_delay)
+            self._ack_check.setChecked(bool(first.status_return_level))
+
+        self._run_task(
+            self._controller.read_bus_tuning, ids,
+            on_done=on_done,
+            label="버스 설정 읽는 중...",
+        )
+
+    def _apply_bus_tuning(self):
+        ids = self._scanned_motor_ids()
+        if not ids:
+            self._log("먼저 모터 스캔을 실행하세요.")
+            return
+        delay = self._return_delay_input.value()
+        level = 1 if self._ack_check.isChecked() else 0
+        reply = QMessageBox.question(
+            self,
+            "버스 설정 적용",
+            f"모터 {ids}에 응답 지연 {delay * 2}µs, 쓰기 응답 {'ON' if level else 'OFF'}을 적용합니다.\n"
+            "모터 EEPROM 설정이 바뀝니다. 계속하시겠습니까?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        def on_done(report):
+            self._log(
+                f"버스 설정 적용 완료 — 쓰기 {report.write_latency_before:.2f} → "
+                f"{report.write_latency_after:.2f} ms, 읽기 {report.read_latency_before:.2f} → "
+                f"{report.read_latency_after:.2f} ms (트랜잭션당)"
+            )
+            self._remember_topology()
+
+        self._run_task(
+            self._controller.tune_bus, ids, delay, level,
+            on_done=on_done,
+            label="버스 설정 적용 중...",
+        )
+
+    def _benchmark_protocol(self):
+        ids = self._scanned_motor_ids()
+        if not ids:
+            self._log("먼저 모터 스캔을 실행하세요.")
+            return
+
+        def on_done(b):
+            self._log(f"통신 벤치마크 ({b.motor_count}개 모터, 초당 상태 읽기 / 트랜잭션):")
+            self._log(f"  st3215 헬퍼: {b.legacy_status_rate:.0f} / {b.legacy_tps:.0f}")
+            self._log(f"  패킷 엔진 블록 읽기: {b.engine_status_rate:.0f} / {b.engine_tps:.0f}")
+            self._log(f"  패킷 엔진 동기 읽기: {b.sync_status_rate:.0f} / {b.sync_tps:.0f}")
+
+        self._run_task(
+            self._controller.benchmark_protocol, ids,
+            on_done=on_done,
+            label="통신 벤치마크 측정 중...",
+        )
+
+    def _auto_calibrate(self):
+        ids = self._scanned_motor_ids()
+        if not ids:
+            self._log("먼저 모터 스캔을 실행하세요.")
+            return
+        reply = QMessageBox.question(
+            self,
+            "자동 캘리브레이션",
+            f"모터 {ids}를 낮은 토크로 양쪽 끝(하드 스톱)까지 동시에 회전시켜\n"
+            "가동 범위를 찾고, 중앙 보정값과 각도 제한을 EEPROM에 저장합니다.\n"
+            "모든 모터가 기구에 장착되어 있고 주변에 장애물이 없는지 확인하세요. 계속하시겠습니까?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        from calibration import auto_calibrate
+
+        def on_done(report):
+            # 캘리브레이션이 끝나면 모든 모터의 토크가 꺼져 있다
+            self._torque_btn.setChecked(False)
+            self._torque_btn.setText("⚡ 토크 ON")
+            for mid, r in sorted(report.results.items()):
+                self._log(
+                    f"  ID {mid}: 범위 {r.min_raw} ~ {r.max_raw}, 보정값 {r.offset:+d}, "
+                    f"제한 {r.min_limit} ~ {r.max_limit}"
+                )
+            for mid, reason in sorted(report.failures.items()):
+                self._log(f"  ⚠ ID {mid}: {reason}")
+            self._log(
+                f"자동 캘리브레이션 완료: {len(report.results)}/{len(ids)}개 모터, {report.elapsed:.1f}초"
+            )
+            self._remember_topology()
+
+        self._run_task(
+            auto_calibrate, self._controller, ids,
+            on_done=on_done,
+            label="자동 캘리브레이션 중... (모든 모터 동시 진행)",
+        )
+
+    def _run_characterization(self):
+        if self._sweep_selected_check.isChecked():
+            if self._current_motor_id is None:
+                self._log("모터를 먼저 선택하세요.")
+                return
+            ids = [self._current_motor_id]
+        else:
+            ids = self._scanned_motor_ids()
+            if not ids:
+                self._log("먼저 모터 스캔을 실행하세요.")
+                return
+        from characterization import SweepPlan, run_sweep
+
+        # 입력값 범위: 속도는 부호 비트를 뺀 15비트, 가속도 0~254, 위치 0~4095
+        limits = {
+            "speeds": ("속도", 1, 0x7FFF),
+            "accelerations": ("가속도", 0, 254),
+            "targets": ("위치", 0, 4095),
+        }
+        values = {}
+        for key, (name, low, high) in limits.items():
+            try:
+                values[key] = [int(x) for x in self._sweep_inputs[key].text().split(",") if x.strip()]
+            except ValueError:
+                values[key] = []
+            if not values[key] or not all(low <= x <= high for x in values[key]):
+                self._log(f"특성 측정 설정이 올바르지 않습니다: {name}는 {low}~{high} 사이 정수를 쉼표로 구분해 입력하세요.")
+                return
+        plan = SweepPlan(**values)
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "특성 측정 결과 저장", "sweep.npz", "NumPy 데이터셋 (*.npz)"
+        )
+        if not path:
+            return
+
+        def measure():
+            start = time.perf_counter()
+            ds = run_sweep(self._controller, ids, plan)
+            ds.save(path)
+            return ds, time.perf_counter() - start
+
+        def on_done(result):
+            ds, elapsed = result
+            self._log(
+                f"특성 측정 완료: {plan.runs}개 조합, {len(ds)}개 샘플 "
+                f"({len(ds) / elapsed:.0f} 샘플/s) → {path}"
+            )
+
+        self._run_task(
+            measure,
+            on_done=on_done,
+            label=f"특성 측정 중... (모터 {ids}, 속도 {plan.speeds} × 가속도 {plan.accelerations} × 위치 {plan.targets})",
+        )
 
     def _ping_motor(self):
         if self._current_motor_id is None:
@@ -864,14 +1522,37 @@ class MainWindow(QMainWindow):
         self._poll_timer.stop()
         self._log("모니터링 중지")
 
+    @traced("ui")
     def _poll_status(self):
         if self._current_motor_id is None:
             return
+        motor_id = self._current_motor_id
+        start = time.perf_counter()
         try:
-            status = self._controller.read_status(self._current_motor_id)
-            self._update_status_display(status)
+            status = self._controller.read_status(motor_id)
+        except (serial.SerialException, OSError):
+            # USB 어댑터가 빠지면 포트 목록 갱신보다 먼저 읽기 오류가 발생
+            self._observe_error(motor_id, start)
+            self._on_connection_lost()
+            return
         except Exception:
-            pass
+            self._observe_error(motor_id, start)
+            return
+        alerts = self._health.update(motor_id, status)
+        if self._metrics:
+            self._metrics.observe(motor_id, status, time.perf_counter() - start)
+            for alert in alerts:
+                self._metrics.observe_alert(motor_id, alert.kind)
+            self._metrics.publish()
+        self._update_status_display(status)
+        for alert in alerts:
+            self._log(f"⚠ ID {alert.motor_id} {alert.message}")
+            self.statusBar().showMessage(f"⚠ ID {alert.motor_id} {alert.message}")
+
+    def _observe_error(self, motor_id: int, start: float):
+        if self._metrics:
+            self._metrics.observe_error(motor_id, time.perf_counter() - start)
+            self._metrics.publish()
 
     def _read_status_once(self):
         if self._current_motor_id is None:
@@ -880,13 +1561,11 @@ class MainWindow(QMainWindow):
         try:
             status = self._controller.read_status(self._current_motor_id)
             self._update_status_display(status)
-            def get_val(v):
-                return v[0] if isinstance(v, tuple) else v
             self._log(
                 f"ID {self._current_motor_id} 상태: "
-                f"위치={get_val(status.position)}, 속도={get_val(status.speed)}, "
-                f"온도={get_val(status.temperature)}°C, 전압={get_val(status.voltage)}V, "
-                f"전류={get_val(status.current)}mA, 부하={get_val(status.load)}%"
+                f"위치={status.position}, 속도={status.speed}, "
+                f"온도={status.temperature}°C, 전압={status.voltage}V, "
+                f"전류={status.current}mA, 부하={status.load}%"
             )
         except Exception as e:
             self._log(f"상태 읽기 실패: {e}")
@@ -0,0 +1,54 @@
+import threading
+from dataclasses import dataclass
+
+import serial.tools.list_ports
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+@dataclass(frozen=True)
+class PortInfo:
+    device: str
+    description: str
+    serial_number: str | None = None
+
+
+def list_usb_ports() -> list[PortInfo]:
+    # 내장 시리얼 포트(ttyS*) 제외, USB 시리얼만 반환
+    return [
+        PortInfo(p.device, p.description, p.serial_number)
+        for p in sorted(serial.tools.list_ports.comports(), key=lambda p: p.device)
+        if "/dev/ttyS" not in p.device
+    ]
+
+
+class PortWatcher(QThread):
+    ports_changed = pyqtSignal(list)
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__()
+        self._interval = interval
+        self._wake = threading.Event()
+        self._running = False
+        self._ports: list[PortInfo] = []
+
+    def rescan(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        self.wait()
+
+    def run(self):
+        self._running = True
+        forced = True
+        while self._running:
+            try:
+                ports = list_usb_ports()
+            except Exception:
+                ports = self._ports
+            if forced or ports != self._ports:
+                self._ports = ports
+                self.ports_changed.emit(ports)
+            forced = self._wake.wait(self._interval)
+            self._wake.clear()